@@ -0,0 +1,345 @@
+"""
+Pathfinding benchmark for ``a_star.Grid``.
+
+Generates seeded, reproducible maps (open fields, mazes, random wall densities and
+perlin noise caves), runs batches of path queries against one or more solvers and
+prints a machine-readable JSON report.
+
+Usage::
+
+    python benchmarks/pathfinding.py --size 40 40 --queries 25 --seed 1 --output bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# pygame prints a banner on import, which would break the JSON report on stdout
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from perlin_noise import PerlinNoise
+from game_core.src.a_star import Grid
+
+RELATIVE_NEIGHBOR_POSITIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+######################
+### Map generators ###
+######################
+# Every generator returns a list of rows, ``walls[y][x]`` is True for blocked cells.
+
+def generate_open_field(size, seed):
+    """
+    Generates a map without any walls.
+
+    :param size: Map size (width, height).
+    :param seed: Unused, kept for a uniform generator signature.
+    :return: Wall map as list of rows.
+    """
+    return [[False for _ in range(size[0])] for _ in range(size[1])]
+
+def generate_random_walls(size, seed, density=0.25):
+    """
+    Generates a map with uniformly distributed walls.
+
+    :param size: Map size (width, height).
+    :param seed: Random seed.
+    :param density: Probability of a cell being a wall.
+    :return: Wall map as list of rows.
+    """
+    rng = random.Random(seed)
+    return [[rng.random() < density for _ in range(size[0])] for _ in range(size[1])]
+
+def generate_maze(size, seed):
+    """
+    Generates a perfect maze with an iterative recursive-backtracker.
+    Cells live on odd coordinates, everything else starts as wall.
+
+    :param size: Map size (width, height).
+    :param seed: Random seed.
+    :return: Wall map as list of rows.
+    """
+    rng = random.Random(seed)
+    width, height = size
+    walls = [[True for _ in range(width)] for _ in range(height)]
+    if width < 3 or height < 3:
+        return walls
+    stack = [(1, 1)]
+    walls[1][1] = False
+    while len(stack) > 0:
+        x, y = stack[-1]
+        candidates = []
+        for dx, dy in RELATIVE_NEIGHBOR_POSITIONS:
+            nx, ny = x + dx * 2, y + dy * 2
+            if 0 < nx < width - 1 and 0 < ny < height - 1 and walls[ny][nx]:
+                candidates.append((nx, ny, dx, dy))
+        if len(candidates) == 0:
+            stack.pop()
+            continue
+        nx, ny, dx, dy = rng.choice(candidates)
+        walls[y + dy][x + dx] = False
+        walls[ny][nx] = False
+        stack.append((nx, ny))
+    return walls
+
+def generate_perlin_caves(size, seed, noise_scale=4, octaves=3, threshold=0.05):
+    """
+    Generates cave-like structures in the style of ``examples/map_gen.py``.
+
+    :param size: Map size (width, height).
+    :param seed: Noise seed.
+    :param noise_scale: Scale of the noise coordinates.
+    :param octaves: Number of noise octaves.
+    :param threshold: Noise values above this threshold become walls.
+    :return: Wall map as list of rows.
+    """
+    noise = PerlinNoise(octaves=octaves, seed=seed)
+    return [[noise([x / size[0] * noise_scale, y / size[1] * noise_scale]) > threshold for x in range(size[0])] for y in range(size[1])]
+
+MAP_GENERATORS = {
+    "open": generate_open_field,
+    "maze": generate_maze,
+    "random_10": lambda size, seed: generate_random_walls(size, seed, density=0.10),
+    "random_25": lambda size, seed: generate_random_walls(size, seed, density=0.25),
+    "random_35": lambda size, seed: generate_random_walls(size, seed, density=0.35),
+    "perlin_caves": generate_perlin_caves,
+}
+
+###############
+### Solvers ###
+###############
+# A solver receives the grid, start and destination position and a list it has to
+# fill with every expanded node. It returns a list of positions or None.
+
+def a_star_solver(grid: Grid, start, destination, expanded_nodes):
+    """
+    Solves a query with ``Grid.get_path``.
+
+    :param grid: Grid with the accessibility of the map applied.
+    :param start: Start position (x, y).
+    :param destination: Destination position (x, y).
+    :param expanded_nodes: List receiving the closed nodes of the search.
+    :return: List of positions or None if no path was found.
+    """
+    path = grid.get_path(grid.get_node(start), grid.get_node(destination), closed_nodes=expanded_nodes)
+    if path is None:
+        return None
+    return [node.get_position() for node in path.get_path()]
+
+SOLVERS = {
+    "a_star": a_star_solver,
+}
+
+###############
+### Helpers ###
+###############
+
+def build_grid(walls):
+    """
+    Creates a ``Grid`` from a wall map.
+
+    :param walls: Wall map as list of rows.
+    :return: The grid.
+    :rtype: Grid
+    """
+    grid = Grid((len(walls[0]), len(walls)))
+    for y, row in enumerate(walls):
+        for x, is_wall in enumerate(row):
+            if is_wall:
+                grid.get_node((x, y)).set_accessibility(False)
+    return grid
+
+def shortest_distances(walls, start):
+    """
+    Breadth first search over the wall map, used as ground truth for path optimality.
+
+    :param walls: Wall map as list of rows.
+    :param start: Start position (x, y).
+    :return: Dictionary mapping reachable positions to their step distance.
+    """
+    width, height = len(walls[0]), len(walls)
+    distances = {start: 0}
+    open_positions = deque([start])
+    while len(open_positions) > 0:
+        x, y = open_positions.popleft()
+        for dx, dy in RELATIVE_NEIGHBOR_POSITIONS:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < width and 0 <= ny < height and not walls[ny][nx] and (nx, ny) not in distances:
+                distances[(nx, ny)] = distances[(x, y)] + 1
+                open_positions.append((nx, ny))
+    return distances
+
+def generate_queries(walls, amount, seed):
+    """
+    Picks reachable (start, destination) pairs together with their optimal step distance.
+
+    :param walls: Wall map as list of rows.
+    :param amount: Number of queries.
+    :param seed: Random seed.
+    :return: List of (start, destination, optimal_distance) tuples.
+    """
+    rng = random.Random(seed)
+    free_positions = [(x, y) for y, row in enumerate(walls) for x, is_wall in enumerate(row) if not is_wall]
+    queries = []
+    if len(free_positions) < 2:
+        return queries
+    attempts = 0
+    while len(queries) < amount and attempts < amount * 20:
+        attempts = attempts + 1
+        start = rng.choice(free_positions)
+        distances = shortest_distances(walls, start)
+        reachable = [position for position in distances if position != start]
+        if len(reachable) == 0:
+            continue
+        destination = rng.choice(reachable)
+        queries.append((start, destination, distances[destination]))
+    return queries
+
+def is_valid_path(walls, path, start, destination):
+    """
+    Checks that a path connects start and destination through free, adjacent cells.
+
+    :param walls: Wall map as list of rows.
+    :param path: List of positions.
+    :param start: Start position (x, y).
+    :param destination: Destination position (x, y).
+    :return: True if the path is valid.
+    """
+    if path is None or len(path) == 0 or path[0] != start or path[-1] != destination:
+        return False
+    for index, (x, y) in enumerate(path):
+        if walls[y][x]:
+            return False
+        if index > 0:
+            px, py = path[index - 1]
+            if abs(px - x) + abs(py - y) != 1:
+                return False
+    return True
+
+##################
+### Benchmarks ###
+##################
+
+def run_queries(solver, walls, queries):
+    """
+    Runs all queries on a fresh grid.
+
+    :return: Tuple of (elapsed seconds, list of (path, expanded node count)).
+    """
+    grid = build_grid(walls)
+    results = []
+    start_time = time.perf_counter()
+    for start, destination, _ in queries:
+        expanded_nodes = []
+        path = solver(grid, start, destination, expanded_nodes)
+        results.append((path, len(expanded_nodes)))
+    return time.perf_counter() - start_time, results
+
+def measure_peak_memory(solver, walls, queries):
+    """
+    Runs all queries again under ``tracemalloc`` and returns the peak allocation in bytes.
+    Kept separate from the timing run because tracing slows down the solver.
+    """
+    grid = build_grid(walls)
+    tracemalloc.start()
+    try:
+        for start, destination, _ in queries:
+            solver(grid, start, destination, [])
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+def benchmark(solver_name, map_name, size, seed, query_amount, measure_memory=True):
+    """
+    Benchmarks one solver on one generated map.
+
+    :param solver_name: Key of ``SOLVERS``.
+    :param map_name: Key of ``MAP_GENERATORS``.
+    :param size: Map size (width, height).
+    :param seed: Seed for the map and the queries.
+    :param query_amount: Number of queries to run.
+    :param measure_memory: If True, the peak memory is measured in an additional run.
+    :return: Dictionary with the benchmark results.
+    """
+    solver = SOLVERS[solver_name]
+    walls = MAP_GENERATORS[map_name](size, seed)
+    queries = generate_queries(walls, query_amount, seed)
+    elapsed, results = run_queries(solver, walls, queries)
+
+    expanded = [expanded_count for _, expanded_count in results]
+    ratios = []
+    failed = 0
+    invalid = 0
+    for (start, destination, optimal), (path, _) in zip(queries, results):
+        if path is None:
+            failed = failed + 1
+            continue
+        if not is_valid_path(walls, path, start, destination):
+            invalid = invalid + 1
+            continue
+        ratios.append((len(path) - 1) / optimal)
+
+    return {
+        "solver": solver_name,
+        "map": map_name,
+        "size": list(size),
+        "seed": seed,
+        "wall_ratio": round(sum(sum(row) for row in walls) / (size[0] * size[1]), 4),
+        "queries": len(queries),
+        "seconds": round(elapsed, 6),
+        "ops_per_sec": round(len(queries) / elapsed, 3) if elapsed > 0 else None,
+        "nodes_expanded_total": sum(expanded),
+        "nodes_expanded_mean": round(sum(expanded) / len(expanded), 3) if len(expanded) > 0 else 0,
+        "peak_memory_bytes": measure_peak_memory(solver, walls, queries) if measure_memory else None,
+        "failed": failed,
+        "invalid": invalid,
+        "optimal": sum(1 for ratio in ratios if ratio == 1.0),
+        "optimality_mean": round(sum(ratios) / len(ratios), 4) if len(ratios) > 0 else None,
+        "optimality_worst": round(max(ratios), 4) if len(ratios) > 0 else None,
+    }
+
+def run(solvers=None, maps=None, size=(32, 32), seed=0, query_amount=20, measure_memory=True):
+    """
+    Benchmarks every combination of solver and map.
+
+    :return: Report dictionary, ready to be dumped as JSON.
+    """
+    solvers = solvers if solvers is not None else list(SOLVERS.keys())
+    maps = maps if maps is not None else list(MAP_GENERATORS.keys())
+    results = []
+    for solver_name in solvers:
+        for map_name in maps:
+            results.append(benchmark(solver_name, map_name, size, seed, query_amount, measure_memory))
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark a_star.Grid pathfinding on seeded maps.")
+    parser.add_argument("--solver", action="append", choices=list(SOLVERS.keys()), help="solver to run, can be repeated (default: all)")
+    parser.add_argument("--map", action="append", choices=list(MAP_GENERATORS.keys()), help="map to run, can be repeated (default: all)")
+    parser.add_argument("--size", nargs=2, type=int, default=(32, 32), metavar=("WIDTH", "HEIGHT"))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = run(args.solver, args.map, tuple(args.size), args.seed, args.queries, not args.no_memory)
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+if __name__ == "__main__":
+    main()
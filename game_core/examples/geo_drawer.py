@@ -8,12 +8,12 @@ class GeoDrawerPrefab(Engine):
         self.border_color = (20, 20, 20)
         self.graph_root_pos = (round(self.core.window_size[0] / 2), round(self.core.window_size[1] / 2))
         self.zoom = 15
-        self.surface = self.core.create_surface()
+        self.surface = self.core.create_layer_surface(render_layer=self.priority_layer, static=True)
         self.draw_coord_system(raster_offset=1)
         self.draw_graph_by_function(lambda x: math.e**x)
 
     def update(self):
-        self.core.draw_surface(self.surface)
+        pass
 
     def fixed_update(self):
         pass
@@ -11,12 +11,19 @@ class Field:
         self._margin = margin
 
         self._is_wall = is_wall
+        self._is_dirty = True
 
     def set_color(self, color):
-        self._color = color
+        if color != self._color:
+            self._color = color
+            self._is_dirty = True
+
+    def is_dirty(self):
+        return self._is_dirty
 
     def draw(self, surface):
-        pygame.draw.rect(surface, self._color if not self._is_wall else self._wall_color, (
+        self._is_dirty = False
+        return pygame.draw.rect(surface, self._color if not self._is_wall else self._wall_color, (
         self._screen_position[0] + self._margin, self._screen_position[1] + self._margin, self._size[0], self._size[1]))
 
     def __eq__(self, other):
@@ -50,13 +57,27 @@ class GridViewPrefab(Engine):
             int(self._grid_size[1] / (self._cell_size[1] + self._margin))
         )
         self._fields = [[self._field_class((x, y), self._cell_size, self._margin) for x in range(self._cell_amount[0])] for y in range(self._cell_amount[1])]
-        self.surface = self.core.create_layer_surface()
+        self._has_dirty_fields = all(hasattr(field, "is_dirty") for field_row in self._fields for field in field_row)
+        self.surface = self.core.create_layer_surface(static=True)
 
     def xy_cell_amount(self):
         return self._cell_amount
 
     def update(self):
+        # the layer is static, only the fields changed since the last frame are drawn again.
+        # Field classes without is_dirty can't tell, they are all drawn every frame
+        if not self._has_dirty_fields:
+            self.redraw()
+            return
+        for field_row in self._fields:
+            for field in field_row:
+                if field.is_dirty():
+                    rect = field.draw(self.surface)
+                    self.surface.mark_dirty(rect if isinstance(rect, pygame.Rect) else None)
+
+    def redraw(self):
         self.draw(self.surface)
+        self.surface.mark_dirty()
 
     def get_field(self, grid_position):
         if grid_position[0] < 0 or grid_position[1] < 0 or grid_position[0] > self._grid_size[0] or grid_position[1] > self._grid_size[1]:
@@ -1,5 +1,5 @@
-from perlin_noise import PerlinNoise
 from game_core.src import *
+import numpy as np
 
 class MagGenPrefab(Engine):
 
@@ -7,64 +7,59 @@ class MagGenPrefab(Engine):
         self.priority_layer = -1
 
     def start(self):
-        self.noise = PerlinNoise()
+        self.noise = GradientNoise(seed=random.randrange(1, 10**5))
         self.pixel_size = 3
         self.noise_scale = 15
         self.noise_offset_x = 0
         self.noise_offset_y = 0
-        self.surface = self.core.create_surface()
+        self.chunk_cells = 64
+        self.scroll_speed = 0.3
+        self.biome_limits = np.array([.04, .05, .07, .3, .32, .4, .5])
+        self.biome_colors_low = np.array([
+            (27, 99, 171),  # Water
+            (153, 151, 83),  # Sand
+            (219, 215, 99),  # Sand
+            (5, 128, 33),  # Grass
+            (157, 189, 164),  # Stone
+            (148, 161, 151),  # Stone
+            (223, 227, 242),  # Snow
+            (129, 194, 224)  # Ice
+        ])
+        self.biome_colors_high = self.biome_colors_low + 1
+        self.biome_colors_high[0] = (57, 120, 184)
+        self.biome_colors_high[3] = (25, 140, 51)
 
-        self.noise_map = [[]]
-        self.update_noise_map()
+        # the world is generated in chunks around the camera on worker threads, scroll with the arrow keys
+        self.world_drawer = self.core.instantiate(WorldStreamDrawerPrefab)
+        self.world_drawer.enable(
+            generate_chunk=self.generate_chunk,
+            chunk_size=(self.chunk_cells * self.pixel_size, self.chunk_cells * self.pixel_size)
+        )
+        self.camera = self.world_drawer.get_camera()
+        self.position = pygame.math.Vector2(self.core.window_size[0] / 2, self.core.window_size[1] / 2)
 
-        self.coroutines = [
-            Coroutine(self.update_map, 3000)
-        ]
-
-    def update_noise_map(self):
-        for x in range(int(self.core.window_size[0] / self.pixel_size)):
-            colum = []
-            for y in range(int(self.core.window_size[1] / self.pixel_size)):
-                colum.append(self.noise([x / self.core.window_size[0] * self.noise_scale + self.noise_offset_x, y / self.core.window_size[1] * self.noise_scale + self.noise_offset_y]))
-            self.noise_map.append(colum)
+    def generate_chunk(self, chunk_x, chunk_y):
+        # runs in a worker thread, returns one color per cell
+        step = (self.noise_scale / self.core.window_size[0], self.noise_scale / self.core.window_size[1])
+        origin = (chunk_x * self.chunk_cells * step[0] + self.noise_offset_x, chunk_y * self.chunk_cells * step[1] + self.noise_offset_y)
+        values = np.abs(self.noise.fill(origin, (self.chunk_cells, self.chunk_cells), step))
+        return self.get_colors(values)
 
     def update(self):
-        self.core.draw_surface(self.surface)
+        keys = self.core.pressed_keys
+        direction = pygame.math.Vector2(
+            (keys[pygame.K_RIGHT] or keys[pygame.K_d]) - (keys[pygame.K_LEFT] or keys[pygame.K_a]),
+            (keys[pygame.K_DOWN] or keys[pygame.K_s]) - (keys[pygame.K_UP] or keys[pygame.K_w])
+        )
+        self.position = self.position + direction * self.scroll_speed * self.core.delta_time
+        self.camera.look_at((int(self.position.x), int(self.position.y)))
 
     def fixed_update(self):
         pass
 
-    def update_map(self):
-        self.surface.fill(self.core.background_color)
-        for x in range(int(self.core.window_size[0] / self.pixel_size)):
-            for y in range(int(self.core.window_size[1] / self.pixel_size)):
-                color = (0, 0, 0)
-
-                if (x == 0 or y == 0 or x == int(self.core.window_size[0] / self.pixel_size) - 1 or y == int(self.core.window_size[1] / self.pixel_size) - 1):
-                    color = (255, 255, 255)
-                else:
-                    ret = self.noise_map[x][y]
-                    ret = abs(ret)
-                    color = self.get_color(ret)
-
-                pygame.draw.rect(self.surface, color, (x * self.pixel_size, y * self.pixel_size, 10, 10))
-
-    def get_color(self, f):
-        color = (245, 66, 167)  # NO COLOR
-        if f < .04:  # Water
-            color = (random.randrange(27, 57), random.randrange(99, 120), random.randrange(171, 184))
-        elif f < .07:  # Sand
-            color = (219, 215, 99)
-            if f < .05:
-                color = (153, 151, 83)
-        elif f < .3:  # Grass
-            color = (random.randrange(5, 25), random.randrange(128, 140), random.randrange(33, 51))
-        elif f < .4:  # Stone
-            color = (148, 161, 151)
-            if f < .32:
-                color = (157, 189, 164)
-        elif f < .5:  # Snow
-            color = (223, 227, 242)
-        else:  # Ice
-            color = (129, 194, 224)
-        return color
\ No newline at end of file
+    def get_colors(self, values):
+        # biome of every cell by its noise value, each biome picks its color channels from [low, high)
+        biomes = np.searchsorted(self.biome_limits, values, side="right")
+        low = self.biome_colors_low[biomes]
+        high = self.biome_colors_high[biomes]
+        return np.random.default_rng().integers(low, high, dtype=np.uint8)
@@ -12,36 +12,31 @@ class PlatformCharacterPrefab(Engine):
             name="_MainDrawSurface",
             width=self.core.window_size[0],
             height=self.core.window_size[1],
-            fill_after_draw=True
+            fill_after_draw=True,
+            track_damage=True
         )
         character_anim = SpriteDirectoryAnimation(os.path.join(LIB_DIR, "examples/assets/pixel-adventure/Main Characters/Ninja Frog"), slicer=SizeSlicer(width=32, height=32)).parse()
-        anim = {}
-        for key, value in character_anim.items():
-            base_key = key.split()[0].lower()
-            anim[base_key] = value
-            anim[f"{base_key}_left"] = [pygame.transform.flip(sprite, True, False) for sprite in value]
+        anim = {key.split()[0].lower(): value for key, value in character_anim.items()}
+        self.facing_left = FrameTransform(flip_x=True)
         
         self.character_sprite_animator = SimpleSpriteAnimator(
-            anim_sprites=anim,
             start_state="idle",
             anim_state_decision=self.anim_sate_decision,
-            sprite_size=(32, 32),
-            fps=1
+            clips=SpriteAnimationClips(anim, (32, 32), fps=1, transform_cache=self.core.get_asset_manager().get_transform_cache())
         )
         self.ground = pygame.Rect(0, self.core.window_size[1]-50, self.core.window_size[0], 10)
-        self.player.colliders = [self.ground]
+        self.player.colliders = ColliderGrid([self.ground])
         
     def anim_sate_decision(self):
-        prefix = "" if self.player.facing_right else "_left"
         vel = self.player.get_velocity()
         abs_direction = abs(self.player.horizontal_direction)
         if self.player.is_jumping:
             if vel.y > 0.1:
-                return f"fall{prefix}"
-            return f"jump{prefix}"   
+                return "fall"
+            return "jump"
         if abs_direction > 0.1:
-            return f"run{prefix}"
-        return f"idle{prefix}"
+            return "run"
+        return "idle"
     
     def update(self):
         keys = self.core.pressed_keys
@@ -52,9 +47,10 @@ class PlatformCharacterPrefab(Engine):
         if keys[pygame.K_SPACE]:
             self.player.jump()
         
-        # Draw character
+        # Draw character, mirrored frames are flipped once and cached
+        self.character_sprite_animator.set_transform(None if self.player.facing_right else self.facing_left)
         self.surface.blit(
             self.character_sprite_animator.animate(self.core.delta_time),
             self.player.get_rect()
         )
-        pygame.draw.rect(self.surface, (255, 255, 0), self.ground)
\ No newline at end of file
+        self.surface.draw.rect((255, 255, 0), self.ground)
\ No newline at end of file
@@ -1,5 +1,5 @@
 from game_core.src import *
-import random
+import numpy as np
 from enum import Enum
 
 class Material(Enum):
@@ -14,14 +14,436 @@ class Material(Enum):
     ICE = 8
     ACID = 9
 
+class PowderGrid:
+    """
+    NumPy backend of the powder simulation. Materials are stored as ``uint8`` values of `Material` and
+    temperatures as ``float32``, both indexed as ``[y, x]``.
+
+    Movement uses a Margolus neighbourhood: the grid is split into 2x2 blocks and every block is updated
+    on its own, so each cell is moved at most once and no two cells move into the same one. The blocks are
+    shifted by one cell between the two sub steps of a step, which lets cells cross the block borders.
+    Fire, ice and acid react only on the few cells holding them.
+
+    The grid is divided into chunks that fall asleep after `SLEEP_STEPS` steps in which nothing in them moved
+    or changed temperature. Chunks with fire, smoke or acid, which change at random, stay awake. A step only
+    processes the awake chunks and their neighbours, so a settled grid costs almost nothing.
+    Writing `materials` or `temperatures` directly must be followed by `wake`, `set_material` wakes on its own.
+    """
+    SLEEP_STEPS = 8
+
+    def __init__(self, width, height, density_map, flammability, melting_point, conductivity=None, seed=None, chunk_size=32, double_buffer=True):
+        """
+        Initializes an empty grid.
+
+        :param width: Number of cells in x.
+        :param height: Number of cells in y.
+        :param density_map: Dictionary `Material` -> density, denser materials sink into lighter ones.
+        :param flammability: Dictionary `Material` -> probability to catch fire from a neighbour.
+        :param melting_point: Dictionary `Material` -> temperature at which ice turns into water.
+        :param conductivity: Dictionary `Material` -> factor applied to the neighbour average by `update_temperature`,
+            0.95 for missing materials. Defaults to 0.9 for stone and wood and 0.7 for water.
+        :param seed: Seed of the random generator.
+        :param chunk_size: Edge length of the sleeping chunks in cells, rounded up to an even number.
+        :param double_buffer: Keeps two grid sized ``float32`` buffers for `update_temperature` instead of allocating them per call.
+        """
+        self.width = width
+        self.height = height
+        self.chunk_size = chunk_size + chunk_size % 2 # keeps the chunks aligned with the 2x2 blocks
+        self.materials = np.zeros((height, width), dtype=np.uint8)
+        self.temperatures = np.zeros((height, width), dtype=np.float32)
+        self._rng = np.random.default_rng(seed)
+        self._moved = np.zeros((height, width), dtype=bool)
+        self._awake = np.ones((-(-height // self.chunk_size), -(-width // self.chunk_size)), dtype=bool)
+        self._quiet_steps = np.zeros(self._awake.shape, dtype=np.uint8)
+        self._regions = None
+
+        material_count = max(material.value for material in Material) + 1
+        if material_count > 16:
+            raise ValueError("PowderGrid supports up to 16 materials, got {}".format(material_count))
+        density = np.zeros(16, dtype=np.int16)
+        for material, value in density_map.items():
+            density[material.value] = value
+        is_fixed = self._make_lut([Material.STONE, Material.ICE])
+        is_falling = self._make_lut([Material.SAND, Material.WATER, Material.ACID])
+        is_liquid = self._make_lut([Material.WATER, Material.ACID])
+        can_displace = (density[:, np.newaxis] > density[np.newaxis, :]) & ~is_fixed[np.newaxis, :]
+        can_displace[:, Material.EMPTY.value] = True
+        smoke = Material.SMOKE.value
+
+        # the movement rules as lookup tables over the 4 bit material values of the cells involved
+        material_ids = np.arange(16)
+        top, bottom = np.meshgrid(material_ids, material_ids, indexing="ij")
+        self._vertical_lut = ((is_falling[top] & can_displace[top, bottom]) | ((bottom == smoke) & can_displace[bottom, top])).ravel()
+        top, below_top, bottom, above_bottom = np.meshgrid(material_ids, material_ids, material_ids, material_ids, indexing="ij")
+        # liquids flow sideways before they fall diagonally, the cell beside the top one is above the bottom one
+        self._diagonal_lut = (
+            (is_falling[top] & ~can_displace[top, below_top] & can_displace[top, bottom] & ~(is_liquid[top] & can_displace[top, above_bottom]))
+            | ((bottom == smoke) & ~can_displace[bottom, above_bottom] & can_displace[bottom, top])
+        ).ravel()
+        left, below_left, right, below_right = top, below_top, bottom, above_bottom
+        self._sideways_lut = (
+            (is_liquid[left] & ~can_displace[left, below_left] & can_displace[left, right])
+            | (is_liquid[right] & ~can_displace[right, below_right] & can_displace[right, left])
+        ).ravel()
+
+        self._flammability = np.zeros(16, dtype=np.float32)
+        for material, value in flammability.items():
+            self._flammability[material.value] = value
+        self._is_dissolvable = self._make_lut([Material.STONE, Material.WOOD, Material.PLANT])
+        self._resets_temperature = self._make_lut([Material.STONE, Material.WATER, Material.ICE])
+        self._is_restless = self._make_lut([Material.FIRE, Material.SMOKE, Material.ACID])
+        self._ice_melting_point = melting_point[Material.ICE]
+
+        if conductivity is None:
+            conductivity = {Material.STONE: 0.9, Material.WOOD: 0.9, Material.WATER: 0.7}
+        # divided by the 8 neighbours up front, exact for a power of two
+        self._conductivity_eighths = np.full(16, np.float32(0.95) / np.float32(8), dtype=np.float32)
+        for material, value in conductivity.items():
+            self._conductivity_eighths[material.value] = np.float32(value) / np.float32(8)
+        self._row_sums = np.zeros(height * width, dtype=np.float32) if double_buffer else None
+        self._next_temperatures = np.zeros(height * width, dtype=np.float32) if double_buffer else None
+
+    def set_material(self, x, y, material):
+        """
+        Sets the material of a cell or of all cells selected by NumPy indices. Stone, water and ice cool down to 0.
+
+        :param x: X index, slice or index array.
+        :param y: Y index, slice or index array.
+        :param material: The `Material`.
+        """
+        self.materials[y, x] = material.value
+        if self._resets_temperature[material.value]:
+            self.temperatures[y, x] = 0
+        self.wake(x, y)
+
+    def wake(self, x=slice(None), y=slice(None)):
+        """
+        Wakes the chunks of a cell or of all cells selected by NumPy indices, the whole grid by default.
+
+        :param x: X index, slice or index array.
+        :param y: Y index, slice or index array.
+        """
+        if isinstance(x, slice) or isinstance(y, slice):
+            selected = np.zeros(self.materials.shape, dtype=bool)
+            selected[y, x] = True
+            self._set_active(self._reduce_to_chunks(selected, 0, 0))
+        else:
+            chunks = np.zeros(self._awake.shape, dtype=bool)
+            chunks[np.asarray(y) // self.chunk_size, np.asarray(x) // self.chunk_size] = True
+            self._set_active(chunks)
+
+    def step(self):
+        """
+        Advances the materials of the awake chunks by one step: reactions of fire, ice and acid, then movement.
+        """
+        self._regions = self._get_active_regions()
+        # changes are detected against a copy that includes the cells a region can write around itself.
+        # temperatures only change along with the materials or next to fire, which keeps its chunk awake
+        snapshots = []
+        for region in self._regions:
+            area = self._get_area(region, 1)
+            snapshots.append((area, self.materials[area].copy()))
+            self._moved[area] = False
+
+        self._update_fire()
+        for region in self._regions:
+            self._update_ice(region)
+        self._update_acid()
+
+        offsets = [(0, 0), (1, 1)]
+        if self._rng.random() < 0.5:
+            offsets.reverse()
+        for offset in offsets:
+            for region in self._regions:
+                self._move_blocks(region, offset)
+
+        for region in self._regions:
+            # smoke that couldn't rise in either sub step dissolves
+            area = self._get_area(region, 0, interior=True)
+            materials = self.materials[area]
+            stuck_smoke = (materials == Material.SMOKE.value) & ~self._moved[area]
+            stuck_smoke &= self._rng.random(stuck_smoke.shape, dtype=np.float32) < 0.1
+            materials[stuck_smoke] = Material.EMPTY.value
+
+        processed = np.zeros(self._awake.shape, dtype=bool)
+        active = np.zeros(self._awake.shape, dtype=bool)
+        size = self.chunk_size
+        for (top, bottom, left, right), (area, materials) in zip(self._regions, snapshots):
+            processed[top // size:-(-bottom // size), left // size:-(-right // size)] = True
+            changed = self.materials[area] != materials
+            changed |= np.take(self._is_restless, self.materials[area])
+            active |= self._reduce_to_chunks(changed, area[0].start, area[1].start)
+        quiet = processed & ~active
+        self._quiet_steps[quiet] = np.minimum(self._quiet_steps[quiet], self.SLEEP_STEPS) + 1
+        self._awake[quiet & (self._quiet_steps >= self.SLEEP_STEPS)] = False
+        self._set_active(active)
+
+    def get_active_regions(self) -> list:
+        """
+        :return: The regions processed by the last `step` as list of `pygame.Rect` in cells.
+        """
+        if self._regions is None:
+            return []
+        return [pygame.Rect(left, top, right - left, bottom - top) for top, bottom, left, right in self._regions]
+
+    def get_awake_chunk_count(self) -> int:
+        """
+        :return: Number of awake chunks.
+        """
+        return int(np.count_nonzero(self._awake))
+
+    def update_temperature(self):
+        """
+        Diffuses the temperature: every non-empty interior cell takes the average of its 8 neighbours,
+        multiplied by the conductivity of its material, and loses 0.1 degrees. Only the regions of the last `step` are updated.
+        """
+        regions = self._regions if self._regions is not None else [(0, self.height, 0, self.width)]
+        temperatures = self.temperatures
+        updates = []
+        buffer_offset = 0
+        for region in regions:
+            area = self._get_area(region, 0, interior=True)
+            top, bottom, left, right = area[0].start, area[0].stop, area[1].start, area[1].stop
+            if top >= bottom or left >= right:
+                continue
+            row_sums, new_temperatures = self._get_temperature_buffers(bottom - top, right - left, buffer_offset)
+            buffer_offset = buffer_offset + new_temperatures.size
+            # separable 3x3 stencil: sums of 3 cells along x, then the rows above and below plus the left and right cell
+            np.add(temperatures[top - 1:bottom + 1, left - 1:right - 1], temperatures[top - 1:bottom + 1, left:right], out=row_sums)
+            row_sums += temperatures[top - 1:bottom + 1, left + 1:right + 1]
+            np.add(row_sums[:-2], row_sums[2:], out=new_temperatures)
+            new_temperatures += temperatures[top:bottom, left - 1:right - 1]
+            new_temperatures += temperatures[top:bottom, left + 1:right + 1]
+            materials = self.materials[area]
+            new_temperatures *= self._conductivity_eighths[materials]
+            new_temperatures -= np.float32(0.1)
+            np.maximum(new_temperatures, np.float32(0), out=new_temperatures)
+            changed = (materials != Material.EMPTY.value) & (new_temperatures != temperatures[area])
+            updates.append((area, new_temperatures, changed))
+        # all regions read the temperatures of the previous step before any is written
+        for area, new_temperatures, changed in updates:
+            np.copyto(temperatures[area], new_temperatures, where=changed)
+            self._set_active(self._reduce_to_chunks(changed, area[0].start, area[1].start))
+
+    def _get_temperature_buffers(self, rows, columns, offset):
+        if self._row_sums is None:
+            return np.empty((rows + 2, columns), dtype=np.float32), np.empty((rows, columns), dtype=np.float32)
+        # contiguous arrays carved from flat buffers, strided views of a grid sized array are twice as slow.
+        # The regions don't overlap, so their results fit next to each other into one grid of cells
+        row_sums = self._row_sums[:(rows + 2) * columns].reshape((rows + 2, columns))
+        return row_sums, self._next_temperatures[offset:offset + rows * columns].reshape((rows, columns))
+
+    def _make_lut(self, materials):
+        lut = np.zeros(16, dtype=bool)
+        for material in materials:
+            lut[material.value] = True
+        return lut
+
+    def _set_active(self, chunks):
+        self._awake |= chunks
+        self._quiet_steps[chunks] = 0
+
+    def _get_active_regions(self):
+        # awake chunks and their neighbours, as runs of chunks per chunk row merged with equal runs below
+        active = self._awake.copy()
+        active[1:] |= self._awake[:-1]
+        active[:-1] |= self._awake[1:]
+        rows = active.copy()
+        active[:, 1:] |= rows[:, :-1]
+        active[:, :-1] |= rows[:, 1:]
+
+        regions = []
+        open_regions = {}
+        for chunk_y in range(active.shape[0]):
+            columns = np.flatnonzero(active[chunk_y])
+            row_regions = {}
+            for run in np.split(columns, np.flatnonzero(np.diff(columns) > 1) + 1) if len(columns) > 0 else []:
+                span = (int(run[0]), int(run[-1]) + 1)
+                region = open_regions.get(span)
+                if region is None:
+                    region = [chunk_y, chunk_y + 1, span[0], span[1]]
+                    regions.append(region)
+                region[1] = chunk_y + 1
+                row_regions[span] = region
+            open_regions = row_regions
+        size = self.chunk_size
+        return [(top * size, min(bottom * size, self.height), left * size, min(right * size, self.width)) for top, bottom, left, right in regions]
+
+    def _get_area(self, region, margin, interior=False):
+        limit = 1 if interior else 0
+        top, bottom, left, right = region
+        return (slice(max(top - margin, limit), min(bottom + margin, self.height - limit)),
+                slice(max(left - margin, limit), min(right + margin, self.width - limit)))
+
+    def _reduce_to_chunks(self, mask, top, left):
+        chunks = np.zeros(self._awake.shape, dtype=bool)
+        if mask.size == 0:
+            return chunks
+        # chunk borders inside the area, relative to its top left corner
+        size = self.chunk_size
+        row_starts = np.unique(np.concatenate(([0], np.arange(-(top % size) + size, mask.shape[0], size))))
+        column_starts = np.unique(np.concatenate(([0], np.arange(-(left % size) + size, mask.shape[1], size))))
+        reduced = np.logical_or.reduceat(np.logical_or.reduceat(mask, row_starts, axis=0), column_starts, axis=1)
+        chunk_top, chunk_left = top // size, left // size
+        chunks[chunk_top:chunk_top + reduced.shape[0], chunk_left:chunk_left + reduced.shape[1]] = reduced
+        return chunks
+
+    def _get_interior_cells(self, material):
+        ys, xs = [], []
+        for region in self._regions:
+            area = self._get_area(region, 0, interior=True)
+            region_ys, region_xs = np.nonzero(self.materials[area] == material.value)
+            ys.append(region_ys + area[0].start)
+            xs.append(region_xs + area[1].start)
+        if len(ys) == 0:
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+        return np.concatenate(ys), np.concatenate(xs)
+
+    def _update_fire(self):
+        materials = self.materials
+        temperatures = self.temperatures
+        ys, xs = self._get_interior_cells(Material.FIRE)
+        if len(ys) == 0:
+            return
+        burnt_out = temperatures[ys, xs] <= 0
+        materials[ys[burnt_out], xs[burnt_out]] = Material.EMPTY.value
+        ys, xs = ys[~burnt_out], xs[~burnt_out]
+        temperatures[ys, xs] -= 1
+
+        extinguished = np.zeros(len(ys), dtype=bool)
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                if dx == 0 and dy == 0:
+                    continue
+                neighbour_ys, neighbour_xs = ys + dy, xs + dx
+                neighbours = materials[neighbour_ys, neighbour_xs]
+                neighbour_temperatures = temperatures[neighbour_ys, neighbour_xs]
+                catches = ~extinguished & (self._rng.random(len(ys), dtype=np.float32) < self._flammability[neighbours])
+                heats = catches & (neighbours == Material.WOOD.value) & (neighbour_temperatures < 100)
+                temperatures[neighbour_ys[heats], neighbour_xs[heats]] += 5
+                ignites = catches & ~heats & (neighbour_temperatures > 150) & (self._rng.random(len(ys), dtype=np.float32) < 0.1)
+                materials[neighbour_ys[ignites], neighbour_xs[ignites]] = Material.FIRE.value
+                temperatures[neighbour_ys[ignites], neighbour_xs[ignites]] = 200
+
+                quenched = ~extinguished & (neighbours == Material.WATER.value) & (self._rng.random(len(ys), dtype=np.float32) < 0.3)
+                materials[ys[quenched], xs[quenched]] = Material.EMPTY.value
+                temperatures[ys[quenched], xs[quenched]] = 0
+                evaporates = quenched & (self._rng.random(len(ys), dtype=np.float32) < 0.5)
+                materials[neighbour_ys[evaporates], neighbour_xs[evaporates]] = Material.EMPTY.value
+                extinguished |= quenched
+
+        ys, xs = ys[~extinguished], xs[~extinguished]
+        spreads = (materials[ys - 1, xs] == Material.EMPTY.value) & (self._rng.random(len(ys), dtype=np.float32) < 0.2)
+        materials[ys[spreads] - 1, xs[spreads]] = Material.FIRE.value
+        temperatures[ys[spreads] - 1, xs[spreads]] = temperatures[ys[spreads], xs[spreads]] * np.float32(0.9)
+        smokes = (self._rng.random(len(ys), dtype=np.float32) < 0.05) & (materials[ys - 1, xs] == Material.EMPTY.value)
+        materials[ys[smokes] - 1, xs[smokes]] = Material.SMOKE.value
+
+    def _update_ice(self, region):
+        area = self._get_area(region, 0, interior=True)
+        interior = self.materials[area]
+        interior_temperatures = self.temperatures[area]
+        melts = (interior == Material.ICE.value) & (interior_temperatures > self._ice_melting_point)
+        interior[melts] = Material.WATER.value
+        interior_temperatures[melts] = 0
+
+    def _update_acid(self):
+        ys, xs = self._get_interior_cells(Material.ACID)
+        active = self._rng.random(len(ys), dtype=np.float32) < 0.3
+        ys, xs = ys[active], xs[active]
+        if len(ys) == 0:
+            return
+        # the first dissolvable neighbour in a random order is a uniformly chosen one of them
+        directions = ((0, 1), (-1, 0), (1, 0), (-1, 1), (1, 1))
+        keys = self._rng.random((len(directions), len(ys)), dtype=np.float32)
+        for index, (dx, dy) in enumerate(directions):
+            keys[index][~self._is_dissolvable[self.materials[ys + dy, xs + dx]]] = 2
+        choices = np.argmin(keys, axis=0)
+        dissolves = (keys.min(axis=0) < 2) & (self._rng.random(len(ys), dtype=np.float32) < 0.5)
+        for index, (dx, dy) in enumerate(directions):
+            selected = dissolves & (choices == index)
+            self.materials[ys[selected] + dy, xs[selected] + dx] = Material.EMPTY.value
+
+    def _move_blocks(self, region, offset):
+        # the region is shifted with the blocks, regions of neighbouring chunks stay disjoint
+        offset_x, offset_y = offset
+        top, bottom, left, right = region
+        region_top, region_left = top + offset_y, left + offset_x
+        height = (min(bottom + offset_y, self.height) - region_top) // 2 * 2
+        width = (min(right + offset_x, self.width) - region_left) // 2 * 2
+        if height <= 0 or width <= 0:
+            return
+        moved = self._moved
+        area = (slice(region_top, region_top + height), slice(region_left, region_left + width))
+        # contiguous copies of the top left, top right, bottom left and bottom right cell of every block
+        corners = ((0, 0), (0, 1), (1, 0), (1, 1))
+        cells = (
+            [self.materials[area][y::2, x::2].copy() for y, x in corners],
+            [self.temperatures[area][y::2, x::2].copy() for y, x in corners],
+            [moved[area][y::2, x::2].copy() for y, x in corners]
+        )
+        materials = cells[0]
+
+        # straight down or up
+        for upper, lower in ((0, 2), (1, 3)):
+            self._swap(cells, upper, lower, np.take(self._vertical_lut, (materials[upper] << 4) | materials[lower]))
+
+        # diagonally if straight down or up is blocked
+        diagonals = [(0, 3, 2, 1), (1, 2, 3, 0)]
+        if self._rng.random() < 0.5:
+            diagonals.reverse()
+        for upper, lower, below_upper, above_lower in diagonals:
+            index = self._get_lut_index(materials[upper], materials[below_upper], materials[lower], materials[above_lower])
+            self._swap(cells, upper, lower, np.take(self._diagonal_lut, index))
+
+        # liquids that can't fall flow sideways, each block decides at random so they don't drift to one side
+        below_rows = np.arange(region_top + 2, region_top + height + 1, 2)
+        below = self.materials[np.minimum(below_rows, self.height - 1), region_left:region_left + width]
+        below[below_rows >= self.height] = Material.STONE.value
+        flows = self._get_coin_flips(materials[0].shape)
+        for first, second, below_first, below_second in ((0, 1, materials[2], materials[3]), (2, 3, below[:, 0::2], below[:, 1::2])):
+            index = self._get_lut_index(materials[first], below_first, materials[second], below_second)
+            self._swap(cells, first, second, np.take(self._sideways_lut, index) & flows)
+
+        for values, target in zip(cells, (self.materials, self.temperatures, moved)):
+            for (y, x), cell_values in zip(corners, values):
+                target[area][y::2, x::2] = cell_values
+
+    def _get_lut_index(self, first, second, third, fourth):
+        index = first.astype(np.uint16) << 12
+        index |= second.astype(np.uint16) << 8
+        index |= third.astype(np.uint16) << 4
+        index |= fourth
+        return index
+
+    def _get_coin_flips(self, shape):
+        # one random bit per cell, much cheaper than comparing random floats
+        return (np.frombuffer(self._rng.bytes(int(np.prod(shape))), dtype=np.uint8).reshape(shape) & 1).view(bool)
+
+    def _swap(self, cells, first, second, mask):
+        materials, temperatures, moved = cells
+        mask = mask & ~moved[first] & ~moved[second]
+        if not mask.any():
+            return
+        # xor swap, a select with a random mask is several times slower
+        material_difference = (materials[first] ^ materials[second]) & (-mask.view(np.uint8))
+        materials[first] ^= material_difference
+        materials[second] ^= material_difference
+        first_bits, second_bits = temperatures[first].view(np.uint32), temperatures[second].view(np.uint32)
+        temperature_difference = (first_bits ^ second_bits) & (-mask.astype(np.uint32))
+        first_bits ^= temperature_difference
+        second_bits ^= temperature_difference
+        # an emptied cell can still be filled in this step, everything else moved or was pushed aside
+        moved[first] |= mask & (materials[first] != Material.EMPTY.value)
+        moved[second] |= mask & (materials[second] != Material.EMPTY.value)
+
 class PowderSimulationPrefab(Engine):
     
     def awake(self, width=300, height=300):
         self.width = width
         self.height = height
         self.cell_size = 3
-        self.grid = None
-        self.temp_grid = None
+        self.powder = None
         self.color_map = {
             Material.EMPTY: (0, 0, 0, 0),
             Material.SAND: (194, 178, 128),
@@ -70,6 +492,12 @@ class PowderSimulationPrefab(Engine):
             Material.ICE: 5,
             Material.WOOD: 200
         }
+
+        self.conductivity = {
+            Material.STONE: 0.9,
+            Material.WOOD: 0.9,
+            Material.WATER: 0.7
+        }
         
         self.burn_duration = {
             Material.WOOD: 300,
@@ -80,56 +508,47 @@ class PowderSimulationPrefab(Engine):
     def start(self):
         self.cell_width = self.width // self.cell_size
         self.cell_height = self.height // self.cell_size
-        self.grid = [[Material.EMPTY for _ in range(self.cell_width)] for _ in range(self.cell_height)]
-        self.temp_grid = [[0.0 for _ in range(self.cell_width)] for _ in range(self.cell_height)]
+        self.powder = PowderGrid(self.cell_width, self.cell_height, self.density_map, self.flammability, self.melting_point, self.conductivity)
         self.surface = self.core.create_layer_surface(width=self.width, height=self.height)
-        
-        for x in range(self.cell_width):
-            self._set_material(x, 0, Material.STONE)
-            self._set_material(x, self.cell_height-1, Material.STONE)
-        for y in range(self.cell_height):
-            self._set_material(0, y, Material.STONE)
-            self._set_material(self.cell_width-1, y, Material.STONE)
+        self.grid_renderer = GridRenderer({material.value: color for material, color in self.color_map.items()}, self.cell_size)
+        self._unheated_materials = np.array([material.value for material in [Material.FIRE, Material.EMPTY, Material.SMOKE]])
+        self._flammable_materials = np.array([material.value for material, flammability in self.flammability.items() if flammability > 0])
+
+        self._set_material(slice(None), 0, Material.STONE)
+        self._set_material(slice(None), self.cell_height-1, Material.STONE)
+        self._set_material(0, slice(None), Material.STONE)
+        self._set_material(self.cell_width-1, slice(None), Material.STONE)
     
     def _place_material(self, x, y, material):
         radius = self.brush_size // 2
-        for dy in range(-radius, radius+1):
-            for dx in range(-radius, radius+1):
-                dist = dx*dx + dy*dy
-                if dist <= radius*radius:
-                    nx, ny = x + dx, y + dy
-                    if 0 <= nx < self.cell_width and 0 <= ny < self.cell_height:
-                        if material == Material.FIRE:
-                            if self.grid[ny][nx] in self.flammability and self.flammability[self.grid[ny][nx]] > 0:
-                                self._set_material(nx, ny, material)
-                                self.temp_grid[ny][nx] = 300
-                        else:
-                            self._set_material(nx, ny, material)
+        dy, dx = np.nonzero(np.add.outer(np.arange(-radius, radius+1) ** 2, np.arange(-radius, radius+1) ** 2) <= radius*radius)
+        ys, xs = y + dy - radius, x + dx - radius
+        inside = (xs >= 0) & (xs < self.cell_width) & (ys >= 0) & (ys < self.cell_height)
+        ys, xs = ys[inside], xs[inside]
+        if material == Material.FIRE:
+            flammable = np.isin(self.powder.materials[ys, xs], self._flammable_materials)
+            ys, xs = ys[flammable], xs[flammable]
+            self._set_material(xs, ys, material)
+            self.powder.temperatures[ys, xs] = 300
+        else:
+            self._set_material(xs, ys, material)
     
     def _set_material(self, x, y, material):
-        self.grid[y][x] = material
-        if material in [Material.STONE, Material.WATER, Material.ICE]:
-            self.temp_grid[y][x] = 0
+        self.powder.set_material(x, y, material)
     
     def _clear_grid(self):
-        for y in range(1, self.cell_height-1):
-            for x in range(1, self.cell_width-1):
-                self._set_material(x, y, Material.EMPTY)
+        self._set_material(slice(1, -1), slice(1, -1), Material.EMPTY)
     
     def _randomize_grid(self):
-        for y in range(1, self.cell_height-1):
-            for x in range(1, self.cell_width-1):
-                r = random.random()
-                if r < 0.1:
-                    self._set_material(x, y, Material.SAND)
-                elif r < 0.2:
-                    self._set_material(x, y, Material.WATER)
-                elif r < 0.21:
-                    self._set_material(x, y, Material.WOOD)
-                elif r < 0.22:
-                    self._set_material(x, y, Material.PLANT)
-                else:
-                    self._set_material(x, y, Material.EMPTY)
+        r = np.random.random((self.cell_height-2, self.cell_width-2))
+        materials = np.select(
+            [r < 0.1, r < 0.2, r < 0.21, r < 0.22],
+            [Material.SAND.value, Material.WATER.value, Material.WOOD.value, Material.PLANT.value],
+            Material.EMPTY.value
+        )
+        self.powder.materials[1:-1, 1:-1] = materials
+        self.powder.temperatures[1:-1, 1:-1][materials == Material.WATER.value] = 0
+        self.powder.wake()
     
     def update(self):
         self._handle_keys()
@@ -188,202 +607,28 @@ class PowderSimulationPrefab(Engine):
 
     
     def _update_physics(self):
-        for y in range(self.cell_height-2, 0, -1):
-            for x in range(1, self.cell_width-1):
-                material = self.grid[y][x]
-                
-                if material == Material.SAND:
-                    self._update_sand(x, y)
-                elif material == Material.WATER:
-                    self._update_water(x, y)
-                elif material == Material.FIRE:
-                    self._update_fire(x, y)
-                elif material == Material.SMOKE:
-                    self._update_smoke(x, y)
-                elif material == Material.ICE:
-                    self._update_ice(x, y)
-                elif material == Material.ACID:
-                    self._update_acid(x, y)
-    
-    def _update_sand(self, x, y):
-        if self._try_move(x, y, 0, 1):
-            return
-            
-        if random.random() < 0.5:
-            if self._try_move(x, y, -1, 1) or self._try_move(x, y, 1, 1):
-                return
-        else:
-            if self._try_move(x, y, 1, 1) or self._try_move(x, y, -1, 1):
-                return
-    
-    def _update_water(self, x, y):
-        if self._try_move(x, y, 0, 1):
-            return
-            
-        directions = [-1, 1]
-        random.shuffle(directions)
-        
-        for dx in directions:
-            if self._try_move(x, y, dx, 0):
-                return
-                
-        for dx in directions:
-            if self._try_move(x, y, dx, 1):
-                return
-    
-    def _update_fire(self, x, y):
-        if self.temp_grid[y][x] <= 0:
-            self._set_material(x, y, Material.EMPTY)
-            return
-            
-        self.temp_grid[y][x] -= 1
-        
-        for dy in [-1, 0, 1]:
-            for dx in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-                    
-                nx, ny = x + dx, y + dy
-                if 0 <= nx < self.cell_width and 0 <= ny < self.cell_height:
-                    neighbor_mat = self.grid[ny][nx]
-                    
-                    if neighbor_mat in self.flammability and random.random() < self.flammability[neighbor_mat]:
-                        if neighbor_mat == Material.WOOD and self.temp_grid[ny][nx] < 100:
-                            self.temp_grid[ny][nx] += 5
-                        elif self.temp_grid[ny][nx] > 150 and random.random() < 0.1:
-                            self._set_material(nx, ny, Material.FIRE)
-                            self.temp_grid[ny][nx] = 200
-                    
-                    if neighbor_mat == Material.WATER and random.random() < 0.3:
-                        self._set_material(x, y, Material.EMPTY)
-                        self.temp_grid[y][x] = 0
-                        if random.random() < 0.5:
-                            self._set_material(nx, ny, Material.EMPTY)
-                        return
-        
-        if y > 0 and self.grid[y-1][x] == Material.EMPTY and random.random() < 0.2:
-            self._set_material(x, y-1, Material.FIRE)
-            self.temp_grid[y-1][x] = self.temp_grid[y][x] * 0.9
-        
-        if random.random() < 0.05:
-            if y > 0 and self.grid[y-1][x] == Material.EMPTY:
-                self._set_material(x, y-1, Material.SMOKE)
-    
-    def _update_smoke(self, x, y):
-        if y > 0 and self._try_move(x, y, 0, -1):
-            return
-        
-        directions = [-1, 1]
-        random.shuffle(directions)
-        for dx in directions:
-            if self._try_move(x, y, dx, -1):
-                return
-                
-        if random.random() < 0.1:
-            self._set_material(x, y, Material.EMPTY)
-    
-    def _update_ice(self, x, y):
-        if self.temp_grid[y][x] > self.melting_point[Material.ICE]:
-            self._set_material(x, y, Material.WATER)
-    
-    def _update_acid(self, x, y):
-        if random.random() < 0.3:
-            directions = [(0, 1), (-1, 0), (1, 0), (-1, 1), (1, 1)]
-            random.shuffle(directions)
-            
-            for dx, dy in directions:
-                nx, ny = x + dx, y + dy
-                if 0 <= nx < self.cell_width and 0 <= ny < self.cell_height:
-                    neighbor_mat = self.grid[ny][nx]
-                    if neighbor_mat in [Material.STONE, Material.WOOD, Material.PLANT]:
-                        if random.random() < 0.5:
-                            self._set_material(nx, ny, Material.EMPTY)
-                        break
-        
-        if self._try_move(x, y, 0, 1):
-            return
-            
-        directions = [-1, 1]
-        random.shuffle(directions)
-        for dx in directions:
-            if self._try_move(x, y, dx, 0):
-                return
-            if self._try_move(x, y, dx, 1):
-                return
-    
-    def _try_move(self, x, y, dx, dy):
-        nx, ny = x + dx, y + dy
-        
-        if 0 <= nx < self.cell_width and 0 <= ny < self.cell_height:
-            current_mat = self.grid[y][x]
-            target_mat = self.grid[ny][nx]
-        
-            if (target_mat == Material.EMPTY or 
-                (self.density_map[current_mat] > self.density_map[target_mat] and 
-                 target_mat not in [Material.STONE, Material.ICE])):
-                
-                self.grid[y][x], self.grid[ny][nx] = self.grid[ny][nx], self.grid[y][x]
-                self.temp_grid[y][x], self.temp_grid[ny][nx] = self.temp_grid[ny][nx], self.temp_grid[y][x]
-                return True
-                
-        return False
+        self.powder.step()
     
     def _update_temperature(self):
-        new_temp = [row[:] for row in self.temp_grid]
-        
-        for y in range(1, self.cell_height-1):
-            for x in range(1, self.cell_width-1):
-                if self.grid[y][x] == Material.EMPTY:
-                    continue
-                    
-                temp_sum = 0
-                count = 0
-                
-                for dy in [-1, 0, 1]:
-                    for dx in [-1, 0, 1]:
-                        if dx == 0 and dy == 0:
-                            continue
-                            
-                        nx, ny = x + dx, y + dy
-                        if 0 <= nx < self.cell_width and 0 <= ny < self.cell_height:
-                            temp_sum += self.temp_grid[ny][nx]
-                            count += 1
-                
-                if count > 0:
-                    avg_temp = temp_sum / count
-                    if self.grid[y][x] in [Material.STONE, Material.WOOD]:
-                        new_temp[y][x] = avg_temp * 0.9
-                    elif self.grid[y][x] == Material.WATER:
-                        new_temp[y][x] = avg_temp * 0.7
-                    else:
-                        new_temp[y][x] = avg_temp * 0.95
-                    
-                    new_temp[y][x] = max(0, new_temp[y][x] - 0.1)
-        
-        self.temp_grid = new_temp
+        self.powder.update_temperature()
     
     def _draw_grid(self):
         self.surface.fill((0, 0, 0, 0))
-        
-        for y in range(self.cell_height):
-            for x in range(self.cell_width):
-                material = self.grid[y][x]
-                color = self.color_map[material]
-                
-                if material not in [Material.FIRE, Material.EMPTY, Material.SMOKE] and self.temp_grid[y][x] > 50:
-                    heat = min(200, self.temp_grid[y][x])
-                    color = (
-                        min(255, color[0] + heat * 0.7),
-                        max(0, color[1] - heat * 0.3),
-                        max(0, color[2] - heat * 0.3),
-                        color[3] if len(color) > 3 else 255
-                    )
-                
-                pygame.draw.rect(
-                    self.surface,
-                    color,
-                    (x * self.cell_size, y * self.cell_size, self.cell_size, self.cell_size)
-                )
+
+        materials = self.powder.materials.T
+        temperatures = self.powder.temperatures.T
+        colors = self.grid_renderer.get_colors(materials)
+
+        heated = (temperatures > 50) & ~np.isin(materials, self._unheated_materials)
+        if heated.any():
+            heat = np.minimum(200, temperatures[heated])
+            heated_colors = colors[heated].astype(np.float64)
+            heated_colors[:, 0] = np.minimum(255, heated_colors[:, 0] + heat * 0.7)
+            heated_colors[:, 1] = np.maximum(0, heated_colors[:, 1] - heat * 0.3)
+            heated_colors[:, 2] = np.maximum(0, heated_colors[:, 2] - heat * 0.3)
+            colors[heated] = heated_colors.astype(np.uint8)
+
+        self.grid_renderer.render_colors(colors, self.surface)
         
         if self.show_debug:
             font = pygame.font.SysFont('Arial', 16)
@@ -391,8 +636,12 @@ class PowderSimulationPrefab(Engine):
                 f"Material: {self.current_material.name}",
                 f"Brush: {self.brush_size}px",
                 f"Speed: {self.simulation_speed}x",
-                f"State: {'RUNNING' if self.is_running else 'PAUSED'}"
+                f"State: {'RUNNING' if self.is_running else 'PAUSED'}",
+                f"Awake chunks: {self.powder.get_awake_chunk_count()}"
             ]
+
+            for region in self.powder.get_active_regions():
+                pygame.draw.rect(self.surface, (255, 0, 0), (region.x * self.cell_size, region.y * self.cell_size, region.width * self.cell_size, region.height * self.cell_size), 1)
             
             for i, text in enumerate(debug_text):
                 text_surface = font.render(text, True, (255 - self.core.background_color[0], 255  - self.core.background_color[1], 255  - self.core.background_color[2]))
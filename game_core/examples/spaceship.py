@@ -75,7 +75,16 @@ class SpaceshipPrefab(Engine):
             render_layer=1,
             fill_after_draw=True
         )
-        self.simple_image_sprite = SimpleImageSprite(os.path.join(LIB_DIR, "examples/assets/sprites/Spaceship/sprite_0.png"))
+        self.simple_image_sprite = SimpleImageSprite(
+            os.path.join(LIB_DIR, "examples/assets/sprites/Spaceship/sprite_0.png"),
+            assets=self.core.get_asset_manager()
+        )
+
+    def on_destroy(self):
+        """
+        Releases the spaceship image.
+        """
+        self.simple_image_sprite.release()
 
     def update(self):
         """
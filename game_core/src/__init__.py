@@ -7,8 +7,16 @@ from .core import *
 from .state_machine import *
 from .shader import *
 from .math import *
+from .noise import *
 from .tilemap import *
+from .world_stream import *
+from .grid_renderer import *
 from .agent import *
+from .asset_manager import *
+from .atlas import *
+from .sprite_cache import *
+from .tilemap_compiler import *
 from .sprite import *
 from .a_star import *
+from .collision import *
 from .character_controller import *
@@ -0,0 +1,499 @@
+import pygame
+from collections import OrderedDict, namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+import io
+import os
+import threading
+import weakref
+
+####################
+### Asset loader ###
+####################
+
+class AssetLoader:
+    """
+    Decodes image files on a thread pool. Only the file read and the decoding run in the workers,
+    the conversion into the display format (`convert_alpha` / `convert`) is finished on the main thread
+    by `process` or `wait`.
+
+    .. code-block:: python
+
+        loader = AssetLoader()
+        futures = loader.load_images(paths)
+        loader.wait(futures) # or call loader.process() every frame
+        surfaces = [future.result() for future in futures]
+    """
+    def __init__(self, max_workers=None):
+        """
+        Initializes the loader.
+
+        :param max_workers: Number of worker threads, defaults to the `ThreadPoolExecutor` default.
+        :type max_workers: int
+        """
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="GameCoreAssetLoader")
+        self._pending = [] # (decode future, result future, alpha)
+        self._lock = threading.Lock()
+        self._main_thread = threading.main_thread()
+
+    def load_image(self, path, alpha=True) -> Future:
+        """
+        Starts decoding an image file.
+
+        :param path: Path to the image file.
+        :type path: str
+        :param alpha: Convert with `convert_alpha()` if True, otherwise with `convert()`.
+        :type alpha: bool
+        :return: A future resolving to the converted `pygame.Surface` once finished on the main thread.
+        :rtype: concurrent.futures.Future
+        """
+        result = Future()
+        decode = self._executor.submit(self._decode, path)
+        with self._lock:
+            self._pending.append((decode, result, alpha))
+        return result
+
+    def load_images(self, paths, alpha=True) -> list:
+        """
+        Starts decoding multiple image files.
+
+        :param paths: Paths to the image files.
+        :type paths: list[str]
+        :param alpha: Convert with `convert_alpha()` if True, otherwise with `convert()`.
+        :type alpha: bool
+        :return: A list of futures in the order of `paths`.
+        :rtype: list[concurrent.futures.Future]
+        """
+        return [self.load_image(path, alpha=alpha) for path in paths]
+
+    def process(self, max_conversions=None):
+        """
+        Finishes decoded images on the main thread. Call it every frame while loading in the background.
+
+        :param max_conversions: Maximum number of images to convert in this call, all if None.
+        :type max_conversions: int
+        :return: Number of images that are still pending.
+        :rtype: int
+        """
+        with self._lock:
+            pending = list(self._pending)
+        finished = []
+        for item in pending:
+            if max_conversions is not None and len(finished) >= max_conversions:
+                break
+            if item[0].done():
+                self._finish(*item)
+                finished.append(item)
+        with self._lock:
+            for item in finished:
+                self._pending.remove(item)
+            return len(self._pending)
+
+    def wait(self, futures=None):
+        """
+        Blocks until images are decoded and finishes them on the main thread.
+
+        :param futures: Futures from `load_image`, all pending images if None.
+        :type futures: list[concurrent.futures.Future]
+        """
+        with self._lock:
+            pending = list(self._pending)
+        if futures is not None:
+            wanted = set(id(future) for future in futures)
+            pending = [item for item in pending if id(item[1]) in wanted]
+        for item in pending:
+            item[0].exception() # blocks until decoded
+            self._finish(*item)
+        with self._lock:
+            for item in pending:
+                self._pending.remove(item)
+
+    def shutdown(self):
+        """
+        Stops the worker threads after the running decodes, decodes that haven't started are cancelled.
+        """
+        with self._lock:
+            for decode, result, alpha in self._pending:
+                if decode.cancel():
+                    result.cancel()
+        self._executor.shutdown(wait=True)
+
+    def _decode(self, path):
+        with open(path, "rb") as file:
+            data = file.read()
+        return pygame.image.load(io.BytesIO(data), os.path.basename(path))
+
+    def _finish(self, decode, result, alpha):
+        if threading.current_thread() is not self._main_thread:
+            raise RuntimeError("assets must be finished on the main thread")
+        error = decode.exception()
+        if error is not None:
+            result.set_exception(error)
+            return
+        surface = decode.result()
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha() if alpha else surface.convert()
+        result.set_result(surface)
+
+#######################
+### Transform cache ###
+#######################
+
+FrameTransform = namedtuple("FrameTransform", ["flip_x", "flip_y", "rotation", "scale"], defaults=[False, False, 0, 1])
+FrameTransform.__doc__ = """
+Transform of a frame, applied in the order flip, rotation, scale.
+
+:var flip_x: Flip horizontally.
+:var flip_y: Flip vertically.
+:var rotation: Counterclockwise rotation in degrees, a multiple of 90.
+:var scale: Integer scale factor.
+"""
+
+class TransformCache:
+    """
+    Computes flipped, rotated and integer scaled variants of surfaces once and shares them.
+    Variants are kept as long as their source surface is alive.
+
+    .. code-block:: python
+
+        cache = TransformCache()
+        left = cache.get(frame, FrameTransform(flip_x=True))
+    """
+    def __init__(self):
+        """
+        Initializes an empty cache.
+        """
+        self._variants = weakref.WeakKeyDictionary() # source surface -> {FrameTransform: surface}
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, surface: pygame.Surface, transform: FrameTransform = None) -> pygame.Surface:
+        """
+        Returns the transformed variant of a surface, computed on the first request.
+
+        :param surface: The source surface.
+        :type surface: pygame.Surface
+        :param transform: The transform, the source surface is returned if None or the identity.
+        :type transform: FrameTransform
+        :return: The shared transformed surface, don't draw into it.
+        :rtype: pygame.Surface
+        :raises ValueError: If the rotation isn't a multiple of 90 or the scale isn't a positive integer.
+        """
+        if transform is None:
+            return surface
+        transform = self._normalize(transform)
+        if transform == _IDENTITY_TRANSFORM:
+            return surface
+        variants = self._variants.get(surface)
+        if variants is None:
+            variants = {}
+            self._variants[surface] = variants
+        variant = variants.get(transform)
+        if variant is None:
+            self._misses = self._misses + 1
+            variant = self._apply(surface, transform)
+            variants[transform] = variant
+        else:
+            self._hits = self._hits + 1
+        return variant
+
+    def get_stats(self) -> dict:
+        """
+        Returns the counters of the cache.
+
+        :return: Dictionary with `sources`, `variants`, `hits` and `misses`.
+        :rtype: dict
+        """
+        return {
+            "sources": len(self._variants),
+            "variants": sum(len(variants) for variants in self._variants.values()),
+            "hits": self._hits,
+            "misses": self._misses,
+        }
+
+    def clear(self):
+        """
+        Drops all variants.
+        """
+        self._variants = weakref.WeakKeyDictionary()
+
+    def _normalize(self, transform):
+        rotation = transform.rotation % 360
+        if rotation % 90 != 0:
+            raise ValueError("rotation must be a multiple of 90, got {}".format(transform.rotation))
+        if int(transform.scale) != transform.scale or transform.scale < 1:
+            raise ValueError("scale must be a positive integer, got {}".format(transform.scale))
+        return FrameTransform(bool(transform.flip_x), bool(transform.flip_y), rotation, int(transform.scale))
+
+    def _apply(self, surface, transform):
+        if transform.flip_x or transform.flip_y:
+            surface = pygame.transform.flip(surface, transform.flip_x, transform.flip_y)
+        if transform.rotation != 0:
+            surface = pygame.transform.rotate(surface, transform.rotation)
+        if transform.scale != 1:
+            surface = pygame.transform.scale(surface, (surface.get_width() * transform.scale, surface.get_height() * transform.scale))
+        return surface
+
+_IDENTITY_TRANSFORM = FrameTransform()
+
+#####################
+### Asset manager ###
+#####################
+
+class AssetHandle:
+    """
+    Reference to a surface held by an `AssetManager`. The asset stays resident until every handle is released.
+    """
+    __slots__ = ("key", "_manager", "_is_released")
+
+    def __init__(self, manager, key):
+        """
+        Initializes an AssetHandle.
+
+        :param manager: The owning manager.
+        :type manager: AssetManager
+        :param key: The asset key.
+        :type key: tuple
+        """
+        self.key = key
+        self._manager = manager
+        self._is_released = False
+
+    def get(self):
+        """
+        Returns the asset.
+
+        :return: A `pygame.Surface`, or a list of surfaces for sliced assets.
+        """
+        if self._is_released:
+            raise ValueError("asset handle already released")
+        return self._manager._get_value(self.key)
+
+    def release(self):
+        """
+        Releases the reference. Further calls are ignored.
+        """
+        if not self._is_released:
+            self._is_released = True
+            self._manager._release(self.key)
+
+    def is_released(self):
+        """
+        :return: True if the handle was released.
+        """
+        return self._is_released
+
+class AssetManager:
+    """
+    Registry of loaded surfaces keyed by path and transform (slice, scale, flip). Identical requests share
+    one decoded surface. Assets are reference counted through `AssetHandle` and unreferenced assets are
+    evicted least recently used first as soon as the resident bytes exceed the budget.
+    The core owns one manager shared by all engines, see `Core.get_asset_manager`.
+    """
+    def __init__(self, budget_bytes=64 * 1024 * 1024, loader: AssetLoader = None):
+        """
+        Initializes the manager.
+
+        :param budget_bytes: Resident bytes above which unreferenced assets are evicted.
+        :type budget_bytes: int
+        :param loader: An optional loader used by `preload` to decode in parallel.
+        :type loader: AssetLoader
+        """
+        self.budget_bytes = budget_bytes
+        self._loader = loader
+        self._assets = OrderedDict() # key -> [value, root surfaces, reference count, base key], least recently used first
+        self._roots = {} # id(root surface) -> [root surface, number of entries using it], subsurfaces share their root
+        self._bytes_resident = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._transform_cache = TransformCache()
+
+    def get_transform_cache(self) -> TransformCache:
+        """
+        Returns the cache for flipped, rotated and scaled variants of the managed assets.
+
+        :return: The shared TransformCache.
+        :rtype: TransformCache
+        """
+        return self._transform_cache
+
+    def acquire(self, path, slicer=None, scale=None, flip=(False, False)) -> AssetHandle:
+        """
+        Returns a handle to an image, loading it only if it isn't resident yet. A transformed image registers
+        its untransformed base and keeps it resident as long as the transformed image is resident.
+
+        :param path: Path to the image file.
+        :type path: str
+        :param slicer: An optional Slicer, the asset is then a list of tiles.
+        :type slicer: Slicer
+        :param scale: An optional size the image is scaled to before slicing.
+        :type scale: tuple
+        :param flip: Flip the image (horizontal, vertical) before scaling.
+        :type flip: tuple
+        :return: A handle, release it when the asset is no longer needed.
+        :rtype: AssetHandle
+        """
+        key = self._get_key(path, slicer, scale, flip)
+        entry = self._assets.get(key)
+        if entry is not None:
+            self._hits = self._hits + 1
+            self._assets.move_to_end(key)
+        else:
+            self._misses = self._misses + 1
+            base_key = self._get_key(path, None, None, (False, False))
+            base_entry = self._assets.get(base_key)
+            if base_entry is None:
+                base_entry = self._add_entry(base_key, pygame.image.load(path).convert_alpha())
+            if key == base_key:
+                entry = base_entry
+            else:
+                base_entry[2] = base_entry[2] + 1
+                entry = self._add_entry(key, self._transform(base_entry[0], slicer, scale, flip), base_key)
+        entry[2] = entry[2] + 1
+        self._evict()
+        return AssetHandle(self, key)
+
+    def preload(self, paths):
+        """
+        Decodes untransformed images in parallel with the loader and keeps them as unreferenced,
+        evictable assets. Later `acquire` calls of these paths are cache hits.
+
+        :param paths: Paths to the image files.
+        :type paths: list[str]
+        """
+        paths = [path for path in paths if self._get_key(path, None, None, (False, False)) not in self._assets]
+        if self._loader is None or len(paths) == 0:
+            for path in paths:
+                self.acquire(path).release()
+            return
+        futures = self._loader.load_images(paths)
+        self._loader.wait(futures)
+        for path, future in zip(paths, futures):
+            self.add(path, future.result())
+
+    def add(self, path, image: pygame.Surface):
+        """
+        Registers an already loaded, untransformed image as unreferenced asset, e.g. decoded by an `AssetLoader`.
+        Does nothing if the path is already resident.
+
+        :param path: Path the image was loaded from.
+        :type path: str
+        :param image: The loaded image.
+        :type image: pygame.Surface
+        """
+        key = self._get_key(path, None, None, (False, False))
+        if key in self._assets:
+            return
+        self._add_entry(key, image)
+        self._evict()
+
+    def is_resident(self, path) -> bool:
+        """
+        :param path: Path to the image file.
+        :type path: str
+        :return: True if the untransformed image is resident.
+        :rtype: bool
+        """
+        return self._get_key(path, None, None, (False, False)) in self._assets
+
+    def get_stats(self) -> dict:
+        """
+        Returns the counters of the manager.
+
+        :return: Dictionary with `bytes_resident`, `budget_bytes`, `assets`, `referenced`, `hits`, `misses`, `hit_rate` and `evictions`.
+        :rtype: dict
+        """
+        requests = self._hits + self._misses
+        return {
+            "bytes_resident": self._bytes_resident,
+            "budget_bytes": self.budget_bytes,
+            "assets": len(self._assets),
+            "referenced": sum(1 for entry in self._assets.values() if entry[2] > 0),
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / requests if requests > 0 else 0.0,
+            "evictions": self._evictions,
+        }
+
+    def clear(self):
+        """
+        Evicts all unreferenced assets regardless of the budget.
+        """
+        keys = [key for key, entry in self._assets.items() if entry[2] == 0]
+        while len(keys) > 0: # removing transformed assets releases their bases
+            for key in keys:
+                self._remove(key)
+            keys = [key for key, entry in self._assets.items() if entry[2] == 0]
+
+    def _get_key(self, path, slicer, scale, flip):
+        return (
+            os.path.abspath(path),
+            slicer.get_config() if slicer is not None else None,
+            tuple(scale) if scale is not None else None,
+            (bool(flip[0]), bool(flip[1])),
+        )
+
+    def _get_value(self, key):
+        entry = self._assets[key]
+        self._assets.move_to_end(key)
+        return entry[0]
+
+    def _release(self, key):
+        entry = self._assets.get(key)
+        if entry is None:
+            return
+        entry[2] = max(0, entry[2] - 1)
+        self._evict()
+
+    def _transform(self, image, slicer, scale, flip):
+        if flip[0] or flip[1]:
+            image = pygame.transform.flip(image, flip[0], flip[1])
+        if scale is not None:
+            image = pygame.transform.scale(image, scale)
+        if slicer is not None:
+            return slicer.slice(image)
+        return image
+
+    def _add_entry(self, key, value, base_key=None):
+        # the bytes of a root surface count once, no matter how many entries hold it or subsurfaces of it
+        surfaces = value if type(value) is list else [value]
+        roots = list({id(surface.get_abs_parent()): surface.get_abs_parent() for surface in surfaces}.values())
+        for root in roots:
+            root_entry = self._roots.get(id(root))
+            if root_entry is None:
+                root_entry = [root, 0]
+                self._roots[id(root)] = root_entry
+                self._bytes_resident = self._bytes_resident + root.get_width() * root.get_height() * root.get_bytesize()
+            root_entry[1] = root_entry[1] + 1
+        entry = [value, roots, 0, base_key]
+        self._assets[key] = entry
+        return entry
+
+    def _evict(self):
+        if self._bytes_resident <= self.budget_bytes:
+            return
+        candidates = [key for key, entry in self._assets.items() if entry[2] == 0]
+        for key in candidates: # grows by the bases released on the way
+            if self._bytes_resident <= self.budget_bytes:
+                break
+            entry = self._assets.get(key)
+            if entry is None or entry[2] > 0:
+                continue
+            self._remove(key)
+            self._evictions = self._evictions + 1
+            base_entry = self._assets.get(entry[3]) if entry[3] is not None else None
+            if base_entry is not None and base_entry[2] == 0:
+                candidates.append(entry[3])
+
+    def _remove(self, key):
+        entry = self._assets.pop(key)
+        for root in entry[1]:
+            root_entry = self._roots[id(root)]
+            root_entry[1] = root_entry[1] - 1
+            if root_entry[1] == 0:
+                del self._roots[id(root)]
+                self._bytes_resident = self._bytes_resident - root.get_width() * root.get_height() * root.get_bytesize()
+        if entry[3] is not None and entry[3] in self._assets:
+            base_entry = self._assets[entry[3]]
+            base_entry[2] = max(0, base_entry[2] - 1)
+
@@ -0,0 +1,256 @@
+from .core import *
+
+#########################
+### MaxRects bin pack ###
+#########################
+
+class MaxRectsBin:
+    """
+    Packs rectangles into a fixed size area with the MaxRects algorithm (best short side fit).
+    """
+    def __init__(self, width, height):
+        """
+        Initializes an empty bin.
+
+        :param width: Width of the bin.
+        :param height: Height of the bin.
+        """
+        self.width = width
+        self.height = height
+        self.used_rects = []
+        self._free_rects = [pygame.Rect(0, 0, width, height)]
+
+    def insert(self, width, height):
+        """
+        Finds and reserves space for a rectangle.
+
+        :param width: Width of the rectangle.
+        :param height: Height of the rectangle.
+        :return: The placed `pygame.Rect` or None if the rectangle doesn't fit.
+        """
+        best_rect = None
+        best_short_side = None
+        best_long_side = None
+        for free_rect in self._free_rects:
+            if free_rect.width < width or free_rect.height < height:
+                continue
+            leftover_x = free_rect.width - width
+            leftover_y = free_rect.height - height
+            short_side = min(leftover_x, leftover_y)
+            long_side = max(leftover_x, leftover_y)
+            if best_rect is None or short_side < best_short_side or (short_side == best_short_side and long_side < best_long_side):
+                best_rect = pygame.Rect(free_rect.x, free_rect.y, width, height)
+                best_short_side = short_side
+                best_long_side = long_side
+        if best_rect is not None:
+            self._place(best_rect)
+        return best_rect
+
+    def occupancy(self):
+        """
+        Returns the used fraction of the bin area.
+
+        :return: A float between 0 and 1.
+        """
+        return sum(rect.width * rect.height for rect in self.used_rects) / float(self.width * self.height)
+
+    def _place(self, rect):
+        free_rects = []
+        for free_rect in self._free_rects:
+            if not free_rect.colliderect(rect):
+                free_rects.append(free_rect)
+                continue
+            if rect.x > free_rect.x:
+                free_rects.append(pygame.Rect(free_rect.x, free_rect.y, rect.x - free_rect.x, free_rect.height))
+            if rect.right < free_rect.right:
+                free_rects.append(pygame.Rect(rect.right, free_rect.y, free_rect.right - rect.right, free_rect.height))
+            if rect.y > free_rect.y:
+                free_rects.append(pygame.Rect(free_rect.x, free_rect.y, free_rect.width, rect.y - free_rect.y))
+            if rect.bottom < free_rect.bottom:
+                free_rects.append(pygame.Rect(free_rect.x, rect.bottom, free_rect.width, free_rect.bottom - rect.bottom))
+
+        # drop free rects that are part of a bigger one
+        self._free_rects = []
+        for index, free_rect in enumerate(free_rects):
+            is_contained = False
+            for other_index, other in enumerate(free_rects):
+                if index != other_index and other.contains(free_rect) and (other != free_rect or other_index < index):
+                    is_contained = True
+                    break
+            if not is_contained:
+                self._free_rects.append(free_rect)
+        self.used_rects.append(rect)
+
+#####################
+### Texture atlas ###
+#####################
+
+class AtlasRegion:
+    """
+    Handle to an image packed into a `TextureAtlas`.
+
+    :var page_index: Index of the atlas page holding the image.
+    :type page_index: int
+    :var page: The atlas page surface, e.g. for batched ``blits`` with `rect` as area.
+    :type page: pygame.Surface
+    :var rect: Area of the image on the page, without padding and extrusion.
+    :type rect: pygame.Rect
+    :var surface: Subsurface of the page showing the image. Can be used as frame for `SimpleSpriteAnimator`.
+    :type surface: pygame.Surface
+    """
+    __slots__ = ("page_index", "page", "rect", "surface")
+
+    def __init__(self, page_index, page, rect):
+        """
+        Initializes an AtlasRegion.
+
+        :param page_index: Index of the atlas page.
+        :param page: The atlas page surface.
+        :param rect: Area of the image on the page.
+        """
+        self.page_index = page_index
+        self.page = page
+        self.rect = rect
+        self.surface = page.subsurface(rect)
+
+class TextureAtlas:
+    """
+    Packs many small surfaces, e.g. animation frames or slicer tiles, into a few large pages.
+    """
+    def __init__(self, page_size=(1024, 1024), padding=1, extrude=0):
+        """
+        Initializes an empty atlas.
+
+        :param page_size: Size of each atlas page.
+        :param padding: Transparent pixels between packed images.
+        :param extrude: Pixels the image borders are repeated outwards, avoids bleeding when scaling.
+        """
+        self._page_size = tuple(page_size)
+        self._padding = padding
+        self._extrude = extrude
+        self._pages = []
+        self._bins = []
+        self._regions = {}
+
+    def add(self, surface: pygame.Surface, key=None) -> AtlasRegion:
+        """
+        Packs a surface into the atlas.
+
+        :param surface: The surface to pack.
+        :param key: Optional key to look the region up later with `get_region`.
+        :return: The `AtlasRegion` of the packed surface.
+        :raises ValueError: If the surface doesn't fit on an empty page.
+        """
+        width = surface.get_width() + self._extrude * 2
+        height = surface.get_height() + self._extrude * 2
+        cell_size = (width + self._padding, height + self._padding)
+
+        page_index = None
+        cell = None
+        for index, page_bin in enumerate(self._bins):
+            cell = page_bin.insert(*cell_size)
+            if cell is not None:
+                page_index = index
+                break
+        if cell is None:
+            if width > self._page_size[0] or height > self._page_size[1]:
+                raise ValueError("surface of size {} doesn't fit into atlas page of size {}".format(surface.get_size(), self._page_size))
+            page_index = self._add_page()
+            cell = self._bins[page_index].insert(*cell_size)
+
+        page = self._pages[page_index]
+        rect = pygame.Rect(cell.x + self._extrude, cell.y + self._extrude, surface.get_width(), surface.get_height())
+        page.blit(surface, rect.topleft)
+        if self._extrude > 0 and rect.width > 0 and rect.height > 0:
+            self._extrude_borders(page, surface, rect)
+
+        region = AtlasRegion(page_index, page, rect)
+        if key is not None:
+            self._regions[key] = region
+        return region
+
+    def add_many(self, surfaces) -> list:
+        """
+        Packs multiple surfaces, largest first for a tighter packing.
+
+        :param surfaces: List of surfaces.
+        :return: List of `AtlasRegion` in the order of `surfaces`.
+        """
+        regions = [None] * len(surfaces)
+        order = sorted(range(len(surfaces)), key=lambda i: surfaces[i].get_width() * surfaces[i].get_height(), reverse=True)
+        for index in order:
+            regions[index] = self.add(surfaces[index])
+        return regions
+
+    def pack_animation(self, anim_sprites: dict) -> dict:
+        """
+        Packs every frame of an animation dictionary, e.g. from `SpriteDirectoryAnimation.parse`.
+
+        :param anim_sprites: Dictionary mapping states to frames. A frame can be a list of layers.
+        :return: A dictionary with the same structure whose frames are atlas subsurfaces.
+        """
+        surfaces = []
+        for frames in anim_sprites.values():
+            frames = frames if type(frames) is list else [frames]
+            for frame in frames:
+                surfaces.extend(frame if type(frame) is list else [frame])
+
+        unique_surfaces = list({id(surface): surface for surface in surfaces}.values())
+        packed = {id(surface): region.surface for surface, region in zip(unique_surfaces, self.add_many(unique_surfaces))}
+
+        def _packed(frame):
+            if type(frame) is list:
+                return [_packed(layer) for layer in frame]
+            return packed[id(frame)]
+
+        return {state: _packed(frames) for state, frames in anim_sprites.items()}
+
+    def get_config(self):
+        """
+        Returns a hashable description of the packing parameters, used as cache key.
+
+        :return: A tuple of page size, padding and extrusion.
+        """
+        return (self._page_size[0], self._page_size[1], self._padding, self._extrude)
+
+    def get_region(self, key) -> AtlasRegion:
+        """
+        Retrieves a region by the key passed to `add`.
+
+        :param key: The key of the region.
+        :return: The `AtlasRegion` or None.
+        """
+        return self._regions.get(key)
+
+    def get_pages(self) -> list:
+        """
+        Returns the atlas pages.
+
+        :return: List of `pygame.Surface` pages.
+        """
+        return self._pages
+
+    def _add_page(self):
+        page = pygame.Surface(self._page_size, pygame.SRCALPHA, 32)
+        if pygame.display.get_surface() is not None:
+            page = page.convert_alpha()
+        self._pages.append(page)
+        self._bins.append(MaxRectsBin(self._page_size[0] + self._padding, self._page_size[1] + self._padding))
+        return len(self._pages) - 1
+
+    def _extrude_borders(self, page, surface, rect):
+        width, height = rect.size
+        left_column = surface.subsurface((0, 0, 1, height))
+        right_column = surface.subsurface((width - 1, 0, 1, height))
+        top_row = surface.subsurface((0, 0, width, 1))
+        bottom_row = surface.subsurface((0, height - 1, width, 1))
+        for offset in range(1, self._extrude + 1):
+            page.blit(left_column, (rect.x - offset, rect.y))
+            page.blit(right_column, (rect.right - 1 + offset, rect.y))
+            page.blit(top_row, (rect.x, rect.y - offset))
+            page.blit(bottom_row, (rect.x, rect.bottom - 1 + offset))
+        size = (self._extrude, self._extrude)
+        page.fill(surface.get_at((0, 0)), pygame.Rect((rect.x - self._extrude, rect.y - self._extrude), size))
+        page.fill(surface.get_at((width - 1, 0)), pygame.Rect((rect.right, rect.y - self._extrude), size))
+        page.fill(surface.get_at((0, height - 1)), pygame.Rect((rect.x - self._extrude, rect.bottom), size))
+        page.fill(surface.get_at((width - 1, height - 1)), pygame.Rect((rect.right, rect.bottom), size))
@@ -1,4 +1,5 @@
 from .core import *
+from .collision import ColliderGrid
 import math
 
 class Direction:
@@ -100,7 +101,7 @@ class PlatformerCharacterControllerPrefab(Engine):
         self.is_jumping = False
         self.facing_right = True
  
-        self.colliders = []
+        self.colliders = [] # list of pygame.Rect or a ColliderGrid
         
     def fixed_update(self):
         """
@@ -115,11 +116,12 @@ class PlatformerCharacterControllerPrefab(Engine):
         dt = self.core.delta_time/1000
         self.acceleration = pygame.math.Vector2(self.character.move_speed * self.horizontal_direction, 0)
         self._apply_gravity()
+        previous_rect = self.rect.copy()
         self._apply_movement(dt)
         self.rect.midbottom = self.position
         
         if self.colliders is not None and len(self.colliders) > 0:
-            self._handle_collisions(self.colliders)
+            self._handle_collisions(self._get_collider_candidates(previous_rect))
         
         if Direction().isDirection(self.horizontal_direction, Direction.RIGHT):
             self.facing_right = True
@@ -148,6 +150,20 @@ class PlatformerCharacterControllerPrefab(Engine):
         self.position += self.velocity * dt + 0.5 * self.acceleration
         self.velocity = pygame.math.Vector2(round(self.velocity.x, 2), round(self.velocity.y, 2))
     
+    def _get_collider_candidates(self, previous_rect):
+        """
+        Returns the colliders that can be hit during this step. A `ColliderGrid` is queried with the
+        swept bounds of the previous and the current rect, a list is returned unfiltered.
+        
+        :param previous_rect: The rect before the movement of this step.
+        :type previous_rect: pygame.Rect
+        :return: List of pygame.Rect colliders.
+        :rtype: list[pygame.Rect]
+        """
+        if isinstance(self.colliders, ColliderGrid):
+            return self.colliders.query(previous_rect.union(self.rect).inflate(2, 2))
+        return self.colliders
+    
     def _handle_collisions(self, colliders):
         """
         Handles collision detection and response with provided colliders.
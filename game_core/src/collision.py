@@ -0,0 +1,184 @@
+from .core import *
+import math
+import numpy as np
+
+###########################
+### Collider extraction ###
+###########################
+
+def merge_solid_cells(solid) -> list:
+    """
+    Greedily merges solid cells into few rectangles: each rectangle takes the longest run of free solid
+    cells in its row and then grows downwards as long as the full run is solid.
+
+    :param solid: 2D boolean array indexed as ``solid[y][x]``.
+    :return: List of (x, y, width, height) tuples in cells.
+    """
+    solid = np.asarray(solid, dtype=bool)
+    height, width = solid.shape
+    remaining = solid.copy()
+    rects = []
+    for y in range(height):
+        row = remaining[y]
+        x = 0
+        while x < width:
+            if not row[x]:
+                x = x + 1
+                continue
+            run_end = x
+            while run_end < width and row[run_end]:
+                run_end = run_end + 1
+            rect_bottom = y + 1
+            while rect_bottom < height and remaining[rect_bottom, x:run_end].all():
+                rect_bottom = rect_bottom + 1
+            remaining[y:rect_bottom, x:run_end] = False
+            rects.append((x, y, run_end - x, rect_bottom - y))
+            x = run_end
+    return rects
+
+def extract_tile_colliders(tile_map, solid_property="solid", solid_layers=None, object_groups=None) -> list:
+    """
+    Extracts the colliders of a `TileMap` or `CompiledTileMap`. Solid tiles are merged into as few
+    rectangles as possible, objects of the object groups are added with their bounding rectangle.
+    The tile map must have been rendered, e.g. with `make_map` or `make_chunks`, for the object groups.
+
+    :param tile_map: The tile map.
+    :param solid_property: Tiles with this custom property set to a true value are solid.
+    :param solid_layers: Indices into `TileMap.get_tile_layers` whose non-empty tiles are all solid.
+    :param object_groups: Names of the object groups to add, all if None. An empty list adds none.
+    :return: List of `pygame.Rect` in map pixels.
+    """
+    tile_width, tile_height = tile_map.get_tile_size()
+    layers = [np.asarray(layer) for layer in tile_map.get_tile_layers()]
+    solid = None
+    if len(layers) > 0:
+        solid = np.zeros(layers[0].shape, dtype=bool)
+        for index, layer in enumerate(layers):
+            if solid_layers is not None and index in solid_layers:
+                solid |= layer != 0
+                continue
+            gids = np.unique(layer)
+            solid_gids = [gid for gid in gids.tolist() if gid != 0 and _is_solid(tile_map.get_tile_properties(gid), solid_property)]
+            if len(solid_gids) > 0:
+                solid |= np.isin(layer, solid_gids)
+
+    colliders = []
+    if solid is not None:
+        for x, y, width, height in merge_solid_cells(solid):
+            colliders.append(pygame.Rect(x * tile_width, y * tile_height, width * tile_width, height * tile_height))
+
+    for object_group in tile_map.tiled_object_groups:
+        if object_groups is not None and object_group["layer"].name not in object_groups:
+            continue
+        for tiled_obj in object_group["tiled_objs"]:
+            rect = _get_object_rect(tiled_obj)
+            if rect is not None:
+                colliders.append(rect)
+    return colliders
+
+def _is_solid(properties, solid_property):
+    if properties is None:
+        return False
+    value = properties.get(solid_property, False)
+    if isinstance(value, str):
+        return value.lower() in ("true", "1", "yes")
+    return bool(value)
+
+def _get_object_rect(tiled_obj):
+    points = getattr(tiled_obj, "points", None)
+    if points:
+        xs = [point[0] for point in points]
+        ys = [point[1] for point in points]
+        rect = pygame.Rect(math.floor(min(xs)), math.floor(min(ys)), 0, 0)
+        rect.width = max(1, math.ceil(max(xs)) - rect.x)
+        rect.height = max(1, math.ceil(max(ys)) - rect.y)
+        return rect
+    width = getattr(tiled_obj, "width", 0) or 0
+    height = getattr(tiled_obj, "height", 0) or 0
+    if width <= 0 or height <= 0:
+        return None # spawn points and other markers
+    return pygame.Rect(int(tiled_obj.x), int(tiled_obj.y), int(round(width)), int(round(height)))
+
+#####################
+### Collider grid ###
+#####################
+
+class ColliderGrid:
+    """
+    Spatial index of static colliders in a uniform grid. A query only visits the cells overlapping the
+    queried rectangle, so its cost depends on the local collider density and not on the level size.
+    Can be assigned to `PlatformerCharacterControllerPrefab.colliders` instead of a list.
+
+    .. code-block:: python
+
+        tile_map = TileMap("level.tmx")
+        tile_map.make_map()
+        player.colliders = ColliderGrid.from_tile_map(tile_map)
+    """
+    def __init__(self, colliders=None, cell_size=128):
+        """
+        Initializes the grid.
+
+        :param colliders: Initial list of `pygame.Rect` colliders.
+        :param cell_size: Edge length of a grid cell in pixels.
+        """
+        self.cell_size = cell_size
+        self._colliders = []
+        self._cells = {} # (cell x, cell y) -> list of collider indices
+        for collider in colliders if colliders is not None else []:
+            self.add(collider)
+
+    @classmethod
+    def from_tile_map(cls, tile_map, solid_property="solid", solid_layers=None, object_groups=None, cell_size=None):
+        """
+        Creates a grid of the colliders of a tile map, see `extract_tile_colliders`.
+
+        :param tile_map: The tile map.
+        :param solid_property: Tiles with this custom property set to a true value are solid.
+        :param solid_layers: Indices into `TileMap.get_tile_layers` whose non-empty tiles are all solid.
+        :param object_groups: Names of the object groups to add, all if None.
+        :param cell_size: Edge length of a grid cell, 8 tiles if None.
+        :return: A new `ColliderGrid`.
+        """
+        if cell_size is None:
+            cell_size = max(tile_map.get_tile_size()) * 8
+        return cls(extract_tile_colliders(tile_map, solid_property, solid_layers, object_groups), cell_size)
+
+    def add(self, collider: pygame.Rect):
+        """
+        Adds a collider.
+
+        :param collider: The collider rectangle.
+        """
+        index = len(self._colliders)
+        self._colliders.append(pygame.Rect(collider))
+        for key in self._get_cell_keys(collider):
+            self._cells.setdefault(key, []).append(index)
+
+    def query(self, rect: pygame.Rect) -> list:
+        """
+        Returns the colliders intersecting a rectangle, e.g. the swept bounds of a moving character.
+
+        :param rect: The queried rectangle.
+        :return: List of `pygame.Rect` in the order they were added.
+        """
+        indices = set()
+        for key in self._get_cell_keys(rect):
+            cell = self._cells.get(key)
+            if cell is not None:
+                indices.update(cell)
+        return [self._colliders[index] for index in sorted(indices) if self._colliders[index].colliderect(rect)]
+
+    def get_colliders(self) -> list:
+        """
+        :return: All colliders.
+        """
+        return list(self._colliders)
+
+    def __len__(self):
+        return len(self._colliders)
+
+    def _get_cell_keys(self, rect):
+        first_x, first_y = rect.left // self.cell_size, rect.top // self.cell_size
+        last_x, last_y = (rect.right - 1) // self.cell_size, (rect.bottom - 1) // self.cell_size
+        return [(x, y) for y in range(first_y, last_y + 1) for x in range(first_x, last_x + 1)]
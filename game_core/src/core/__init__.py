@@ -3,4 +3,4 @@ from .core import *
 from .coroutine import Coroutine
 from .engine import Engine
 from .scene_manager import SceneManager, SurfaceStack, Scene, scene
-from .surface_stack import SurfaceStack, SurfaceStackElement
\ No newline at end of file
+from .surface_stack import SurfaceStack, SurfaceStackElement, TrackedSurface
\ No newline at end of file
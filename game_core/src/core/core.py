@@ -2,10 +2,13 @@ import sys
 import random
 import pygame
 import string
+import weakref
 
 from pygame import Surface
 from .engine import Engine
+from .surface_stack import TrackedSurface
 from .scene_manager import SceneManager
+from ..asset_manager import AssetManager
 
 class Core:
     """
@@ -29,10 +32,14 @@ class Core:
 
     @window_size.setter
     def window_size(self, value):
+        old_format = None
         if self.window is not None:
+            old_format = self._get_display_format()
             pygame.display.quit()
         self.window = pygame.display.set_mode(value, flags=self._flags, depth=self._depth, display=self._display)
         self._window_size = value
+        if old_format is not None and old_format != self._get_display_format():
+            self._reconvert_layer_surfaces()
 
     def __init__(self,
             title='GameCore <3',
@@ -42,7 +49,8 @@ class Core:
             fps=30,
             display=0,
             window_flags=pygame.DOUBLEBUF,
-            window_depth=32):
+            window_depth=32,
+            asset_budget=64 * 1024 * 1024):
 
         """
         Initializes the Core framework.
@@ -61,16 +69,20 @@ class Core:
         :type window_flags: int
         :param window_depth: Bit depth for the window.
         :type window_depth: int
+        :param asset_budget: Bytes of unreferenced assets the asset manager keeps resident.
+        :type asset_budget: int
         """
 
         # private properties
         self._fixed_update_interval_counter = 0
         self._scene_manager = SceneManager(self)
+        self._asset_manager = AssetManager(budget_bytes=asset_budget)
         self._display = display
         self._flags = window_flags
         self._depth = window_depth
         self._window_size = None
         self._start_scene = start_scene
+        self._managed_surfaces = weakref.WeakKeyDictionary() # surface -> declared opacity
 
         # config able properties
         self.window = None
@@ -108,6 +120,15 @@ class Core:
         :rtype: SceneManager
         """
         return self._scene_manager
+
+    def get_asset_manager(self):
+        """
+        Retrieves the AssetManager shared by all engines and prefabs.
+
+        :returns: The AssetManager instance.
+        :rtype: AssetManager
+        """
+        return self._asset_manager
     
     def _key_listener(self):
         self.mouse_position = pygame.mouse.get_pos()
@@ -129,6 +150,7 @@ class Core:
         while self.is_running:
             self.window.fill(self.background_color)
             self._key_listener()
+            self.get_scene_manager()._update()
             self.get_scene_manager().scene()._update()
             if self._fixed_update_interval_counter >= self.fixed_update_interval:
                 self._fixed_update_interval_counter = self._fixed_update_interval_counter - self.fixed_update_interval #add rest of interval_counter back
@@ -138,6 +160,7 @@ class Core:
             pygame.display.update()
             pygame.display.flip()
             self._time_calculation()
+        self.get_scene_manager()._shutdown()
         pygame.quit()
         sys.exit()
 
@@ -172,7 +195,19 @@ class Core:
         """
         self._scene_manager.scene().get_surface_stack().get_element(name).surface_render_position = position
 
-    def create_layer_surface(self, name=None, width=0, height=0, x=0, y=0, render_layer: int = 0, fill_after_draw=True):
+    def mark_layer_surface_dirty(self, name, rect=None):
+        """
+        Marks an area of a layer's surface as drawn into. Only needed for layers created with `track_damage`
+        or `static` that are drawn into without the `TrackedSurface` methods, e.g. via `pygame.draw.*`.
+
+        :param name: The name of the layer.
+        :type name: str
+        :param rect: The area that was drawn into. Marks the whole surface if None.
+        :type rect: pygame.Rect, optional
+        """
+        self._scene_manager.scene().get_surface_stack().get_element(name).mark_dirty(rect)
+
+    def create_layer_surface(self, name=None, width=0, height=0, x=0, y=0, render_layer: int = 0, fill_after_draw=True, track_damage=False, static=False, opaque=False):
         """
         Creates a new rendering layer surface.
 
@@ -190,9 +225,19 @@ class Core:
         :type render_layer: int
         :param fill_after_draw: Auto-fill the surface after drawing.
         :type fill_after_draw: bool
-
-        :returns: The created surface.
-        :rtype: pygame.Surface
+        :param track_damage: Create a `TrackedSurface` and draw and clear only the area drawn into.
+        :type track_damage: bool
+        :param static: Create a `TrackedSurface` that is baked into a cached composite with its static neighbours.
+                       The composite is rebuilt only when the surface is drawn into or marked dirty.
+        :type static: bool
+        :param opaque: Create the surface without per-pixel alpha in the display format. Blits much faster,
+                       but covers everything below it.
+        :type opaque: bool
+
+        :returns: The created surface. It stays valid when the display format changes, the surface is converted
+                  in place. Its pixel buffer is reallocated then, so subsurfaces taken from it become invalid
+                  and must be taken again.
+        :rtype: pygame.Surface or TrackedSurface
         """
         if width == 0:
             width = self.window_size[0]
@@ -201,25 +246,116 @@ class Core:
         if name == None:
             name = ''.join(random.choice(string.ascii_uppercase + string.digits) for _ in range(8))
 
-        img = pygame.surface.Surface((width, height), pygame.SRCALPHA, 32)
-        self._scene_manager.scene().get_surface_stack().add_element(name, img.convert_alpha(), render_layer, surface_render_position=(x, y), fill_after_draw=fill_after_draw)
+        img = self.create_surface((width, height), opaque=opaque)
+        if track_damage or static:
+            img = self._to_tracked_surface(img)
+            self._managed_surfaces[img] = opaque
+        self._scene_manager.scene().get_surface_stack().add_element(name, img, render_layer, surface_render_position=(x, y), fill_after_draw=fill_after_draw, track_damage=track_damage, static=static)
 
         return self.get_layer_surface(name)
 
-    def create_surface(self, size=None) -> Surface:
+    def create_surface(self, size=None, opaque=False) -> Surface:
         """
-        Creates a new surface with specified dimensions.
+        Creates a new surface with specified dimensions in the display pixel format.
 
         :param size: The size of the surface as a (width, height) tuple.
                      Defaults to the size of the main window if not specified.
         :type size: tuple[int, int], optional
+        :param opaque: Create the surface without per-pixel alpha, e.g. for backgrounds.
+        :type opaque: bool, optional
         :return: A new surface object with the specified or default size.
         :rtype: pygame.Surface
         """
         if size is None:
             size = self.window_size
-        img = pygame.surface.Surface((size[0], size[1]), pygame.SRCALPHA, 32)
-        return img.convert_alpha()
+        if opaque:
+            img = pygame.surface.Surface((size[0], size[1]))
+        else:
+            img = pygame.surface.Surface((size[0], size[1]), pygame.SRCALPHA, 32)
+        return self.convert_surface(img, opaque=opaque)
+
+    def convert_surface(self, surface, opaque=False) -> Surface:
+        """
+        Converts a surface to the display pixel format, with `convert()` for opaque surfaces and
+        `convert_alpha()` otherwise. Surfaces in the display format blit without per-pixel conversion.
+
+        :param surface: The surface to convert, e.g. a loaded image.
+        :type surface: pygame.Surface
+        :param opaque: True if the surface has no transparent pixels.
+        :type opaque: bool, optional
+        :return: The converted surface.
+        :rtype: pygame.Surface
+        """
+        converted = surface.convert() if opaque else surface.convert_alpha()
+        self._managed_surfaces[converted] = opaque
+        return converted
+
+    def pixel_format_report(self, only_mismatches=False):
+        """
+        Lists the pixel formats of all layer surfaces of the current scene and of all surfaces
+        created or converted by the core, and flags those that don't match the display format.
+
+        :param only_mismatches: Only list surfaces that don't match the display format.
+        :type only_mismatches: bool, optional
+        :return: One dictionary per surface with `name`, `size`, `bitsize`, `alpha`, `opaque` and `matches_display`.
+        :rtype: list[dict]
+        """
+        report = []
+        layer_surfaces = set()
+        if self._scene_manager.scene() is not None:
+            for element in self._scene_manager.scene().get_surface_stack().get_elements():
+                layer_surfaces.add(id(element.surface))
+                report.append(self._pixel_format_entry(element.name, element.surface))
+        for surface in list(self._managed_surfaces.keys()):
+            if id(surface) not in layer_surfaces:
+                report.append(self._pixel_format_entry(None, surface))
+        if only_mismatches:
+            report = [entry for entry in report if not entry["matches_display"]]
+        return report
+
+    def _pixel_format_entry(self, name, surface):
+        opaque = self._managed_surfaces.get(surface, not surface.get_flags() & pygame.SRCALPHA)
+        return {
+            "name": name,
+            "size": surface.get_size(),
+            "bitsize": surface.get_bitsize(),
+            "alpha": bool(surface.get_flags() & pygame.SRCALPHA),
+            "opaque": opaque,
+            "matches_display": self._matches_display_format(surface, opaque),
+        }
+
+    def _get_display_format(self):
+        return (self.window.get_bitsize(), self.window.get_masks()[:3])
+
+    def _matches_display_format(self, surface, opaque):
+        if (surface.get_bitsize(), surface.get_masks()[:3]) != self._get_display_format():
+            return False
+        has_alpha = bool(surface.get_flags() & pygame.SRCALPHA)
+        return has_alpha != opaque
+
+    def _to_tracked_surface(self, surface):
+        tracked = TrackedSurface(surface.get_size(), surface.get_flags() & pygame.SRCALPHA, surface)
+        pygame.Surface.blit(tracked, surface, (0, 0))
+        return tracked
+
+    def _reconvert_layer_surfaces(self):
+        for scene in self._scene_manager.get_scenes():
+            for element in scene.get_surface_stack().get_elements():
+                if element.surface not in self._managed_surfaces:
+                    continue
+                opaque = self._managed_surfaces[element.surface]
+                if self._matches_display_format(element.surface, opaque):
+                    continue
+                self._convert_surface_in_place(element.surface, opaque)
+                element.mark_dirty()
+
+    def _convert_surface_in_place(self, surface, opaque):
+        # the surface object is kept, prefabs holding it from create_layer_surface keep drawing into the stack.
+        # Re-initializing reallocates the pixels: subsurfaces of it point to the freed buffer and must not be used,
+        # references to the object itself, e.g. the draw proxy of a TrackedSurface, stay valid
+        pixels = pygame.Surface.copy(surface)
+        pygame.Surface.__init__(surface, surface.get_size(), 0 if opaque else pygame.SRCALPHA, self.window)
+        pygame.Surface.blit(surface, pixels, (0, 0))
 
     def draw_surface(self, surface, position=None):
         """
@@ -1,6 +1,8 @@
 from .engine import Engine
 from .surface_stack import SurfaceStack
+from ..asset_manager import AssetLoader
 import inspect
+import time
 
 def scene(name):
     """
@@ -25,6 +27,9 @@ class Scene:
         self._engines = engines if engines is not None else []
         self._surface_stack = SurfaceStack()
         self._core = core
+        self._load_steps = None # generator running awake and start, one engine per step
+        self._is_loaded = False
+        self._preload_errors = [] # (path, exception) of assets that failed to preload
         
     def get_surface_stack(self) -> SurfaceStack:
         """
@@ -110,13 +115,63 @@ class Scene:
             raise Exception("value must be a class")
         return engine_list
 
+    def is_loaded(self) -> bool:
+        """
+        Checks whether all engines of the scene are awake and started, e.g. after `SceneManager.preload`.
+
+        :return: True if the scene is loaded.
+        :rtype: bool
+        """
+        return self._is_loaded
+
+    def get_preload_errors(self):
+        """
+        Retrieves the assets of `SceneManager.preload` that failed to load and weren't raised yet.
+
+        :return: List of (path, exception) tuples.
+        :rtype: list[tuple]
+        """
+        return list(self._preload_errors)
+
+    def _raise_preload_errors(self):
+        if len(self._preload_errors) == 0:
+            return
+        path, error = self._preload_errors[0]
+        self._preload_errors = []
+        raise Exception("failed to preload '{}' for scene '{}'".format(path, self._name)) from error
+
     def _on_enter(self):
-        self._call_awake_func()
-        self._engines = sorted(self._engines, key=lambda x: x.priority_layer, reverse=False)
-        self._call_start_func()
+        while self._load_step():
+            pass
 
     def _on_exit(self):
         self._call_destroy_func()
+        self._load_steps = None
+        self._is_loaded = False
+
+    def _load_step(self):
+        if self._is_loaded:
+            return False
+        if self._load_steps is None:
+            self._load_steps = self._iter_load_steps()
+        try:
+            next(self._load_steps)
+            return True
+        except StopIteration:
+            self._load_steps = None
+            self._is_loaded = True
+            return False
+
+    def _iter_load_steps(self):
+        for engine in list(self._engines):
+            engine.awake()
+            yield
+        self._engines = sorted(self._engines, key=lambda x: x.priority_layer, reverse=False)
+        for engine in list(self._engines):
+            if engine.is_enabled and not engine._is_started:
+                engine.start()
+                engine._is_started = True
+                yield
 
     def _update(self):
         self._call_update_func()
@@ -124,18 +179,6 @@ class Scene:
     def _fixed_update(self):
         self._call_fixed_update_func()
     
-    def _call_awake_func(self):
-        if len(self._engines) > 0:
-            for engine in self._engines:
-                 engine.awake()
-
-    def _call_start_func(self):
-        if len(self._engines) > 0:
-            for engine in self._engines:
-                if engine.is_enabled and not engine._is_started:
-                    engine.start()
-                    engine._is_started = True
-
     def _call_update_func(self):
         if len(self._engines) > 0:
             for engine in self._engines:
@@ -156,11 +199,28 @@ class Scene:
                 engine.on_destroy()
 
 class SceneManager:
+    """
+    Manages the scenes and switches between them.
+
+    Scenes can be loaded ahead with `preload`: the engines of the scene are awaked and started a few at a time
+    within `load_budget_ms` per frame while the current scene keeps running and rendering, and the given
+    asset files are decoded on worker threads. `set_scene(name, asynchronous=True)` swaps to the scene once
+    it is loaded.
+
+    :var load_budget_ms: Milliseconds per frame spent on preloading. At least one step runs every frame.
+    :type load_budget_ms: float
+    """
     def __init__(self, core):
         self._scenes = []
         self._current_scene = None
         self._core = core
-        
+        self._context_scene = None # scene returned by `scene()` while one of its engines is loaded
+        self._preloading_scenes = []
+        self._pending_scene = None
+        self._asset_loader = None
+        self._asset_futures = [] # (scene, path, future)
+        self.load_budget_ms = 4
+
     def setup_engine(self, scene_name, engine):
         for scene in self._scenes:
             if scene._name == scene_name:
@@ -168,23 +228,152 @@ class SceneManager:
                 return
         self._scenes.append(Scene(self._core, scene_name, [engine]))
 
-    def set_scene(self, scene_name):
+    def set_scene(self, scene_name, asynchronous=False):
+        """
+        Switches to a scene. The current scene is exited and the new scene is entered.
+
+        :param scene_name: Name of the scene, the first registered scene if None.
+        :type scene_name: str
+        :param asynchronous: Preload the scene within the per-frame budget and swap once it is loaded.
+                             The current scene keeps running until then.
+        :type asynchronous: bool
+        """
         if len(self._scenes) == 0:
             raise Exception("No scenes available")
         if scene_name == None:
             self._current_scene = self._scenes[0]
-            self._current_scene._on_enter()
+            self._enter(self._current_scene)
             return
+        scene = self.get_scene(scene_name)
+        if scene is None:
+            return
+        if asynchronous:
+            self.preload(scene_name)
+            self._pending_scene = scene
+            return
+        self._swap(scene)
+
+    def preload(self, scene_name, asset_paths=None):
+        """
+        Starts loading a scene in the background of the current one. Every frame the engines of the scene are
+        awaked and started within `load_budget_ms`, layer surfaces and prefabs they create belong to the
+        preloaded scene. The image files in `asset_paths` are decoded on worker threads and registered in
+        the core's `AssetManager`. Assets that fail to load are raised when the scene is entered.
+
+        :param scene_name: Name of the scene.
+        :type scene_name: str
+        :param asset_paths: Image files to warm up in the asset manager.
+        :type asset_paths: list[str]
+        """
+        scene = self.get_scene(scene_name)
+        if scene is None:
+            raise ValueError("scene '{}' doesn't exist".format(scene_name))
+        if asset_paths:
+            if self._asset_loader is None:
+                self._asset_loader = AssetLoader()
+            assets = self._core.get_asset_manager()
+            paths = [path for path in asset_paths if not assets.is_resident(path)]
+            self._asset_futures.extend((scene, path, future) for path, future in zip(paths, self._asset_loader.load_images(paths)))
+        if scene is not self._current_scene and not scene.is_loaded() and scene not in self._preloading_scenes:
+            self._preloading_scenes.append(scene)
+
+    def is_preloaded(self, scene_name) -> bool:
+        """
+        Checks whether a scene is loaded and all preloaded assets are resident.
+
+        :param scene_name: Name of the scene.
+        :type scene_name: str
+        :return: True if the scene can be entered without loading.
+        :rtype: bool
+        """
+        scene = self.get_scene(scene_name)
+        return scene is not None and scene.is_loaded() and not any(item[0] is scene for item in self._asset_futures)
+
+    def get_scene(self, scene_name) -> Scene:
+        """
+        Retrieves a scene by name.
+
+        :param scene_name: Name of the scene.
+        :type scene_name: str
+        :return: The scene or None.
+        :rtype: Scene
+        """
         for scene in self._scenes:
             if scene._name == scene_name:
-                if self._current_scene is not None:
-                    self._current_scene._on_exit()
-                self._current_scene = scene
-                self._current_scene._on_enter()
-                return
-        
+                return scene
+        return None
+
+    def get_scenes(self):
+        """
+        Retrieves all registered scenes.
+        """
+        return list(self._scenes)
+
     def scene(self) -> Scene:
         """
-        Retrieves the current scene.
+        Retrieves the current scene, or the preloaded scene while one of its engines is loaded.
         """
-        return self._current_scene
\ No newline at end of file
+        if self._context_scene is not None:
+            return self._context_scene
+        return self._current_scene
+
+    def _update(self):
+        # called once per frame by the core before the current scene is updated
+        if len(self._preloading_scenes) > 0 or len(self._asset_futures) > 0:
+            deadline = time.perf_counter() + self.load_budget_ms / 1000
+            while True:
+                has_progressed = self._process_preloaded_asset()
+                has_progressed = self._load_scene_step() or has_progressed
+                if not has_progressed or time.perf_counter() >= deadline:
+                    break
+        if self._pending_scene is not None and self.is_preloaded(self._pending_scene._name):
+            # cleared after the swap, a scene raising its preload errors is swapped in on the next frame
+            self._swap(self._pending_scene)
+            self._pending_scene = None
+
+    def _shutdown(self):
+        # called by the core when the game loop ends
+        if self._asset_loader is not None:
+            self._asset_loader.shutdown()
+            self._asset_loader = None
+        self._asset_futures = []
+
+    def _process_preloaded_asset(self):
+        if len(self._asset_futures) == 0:
+            return False
+        self._asset_loader.process(max_conversions=1)
+        finished = [item for item in self._asset_futures if item[2].done()]
+        assets = self._core.get_asset_manager()
+        for scene, path, future in finished:
+            self._asset_futures.remove((scene, path, future))
+            if future.exception() is None:
+                assets.add(path, future.result())
+            else:
+                scene._preload_errors.append((path, future.exception()))
+                if scene is self._current_scene:
+                    scene._raise_preload_errors()
+        return len(finished) > 0
+
+    def _load_scene_step(self):
+        if len(self._preloading_scenes) == 0:
+            return False
+        scene = self._preloading_scenes[0]
+        self._context_scene = scene
+        try:
+            if not scene._load_step():
+                self._preloading_scenes.remove(scene)
+        finally:
+            self._context_scene = None
+        return True
+
+    def _swap(self, scene):
+        scene._raise_preload_errors() # before the current scene is exited, so it keeps running
+        if self._current_scene is not None:
+            self._current_scene._on_exit()
+        self._current_scene = scene
+        self._enter(scene)
+
+    def _enter(self, scene):
+        if scene in self._preloading_scenes:
+            self._preloading_scenes.remove(scene)
+        scene._on_enter()
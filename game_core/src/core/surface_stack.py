@@ -1,3 +1,95 @@
+import bisect
+import pygame
+
+class TrackedDraw:
+    """
+    Proxy for the `pygame.draw` module bound to a `TrackedSurface`.
+    Every call draws onto the surface and reports the returned bounding rect as damage,
+    e.g. ``surface.draw.rect(color, rect)`` instead of ``pygame.draw.rect(surface, color, rect)``.
+    """
+    def __init__(self, surface):
+        """
+        Initializes the proxy.
+
+        :param surface: The surface to draw onto.
+        :type surface: TrackedSurface
+        """
+        self._surface = surface
+
+    def __getattr__(self, name):
+        draw_func = getattr(pygame.draw, name)
+
+        def _draw(*args, **kwargs):
+            rect = draw_func(self._surface, *args, **kwargs)
+            self._surface.mark_dirty(rect)
+            return rect
+
+        return _draw
+
+class TrackedSurface(pygame.Surface):
+    """
+    A `pygame.Surface` that accumulates the area drawn into by `blit`, `blits`, `fill`, `set_at`
+    and the `draw` proxy. Drawing with `pygame.draw.*` directly is not tracked, use `draw` or `mark_dirty` instead.
+
+    :var draw: `pygame.draw` proxy bound to this surface.
+    :type draw: TrackedDraw
+    """
+    def __init__(self, size, flags=0, depth=32, on_damage=None):
+        """
+        Initializes a TrackedSurface.
+
+        :param size: Size of the surface.
+        :type size: tuple
+        :param flags: Pygame surface flags.
+        :type flags: int
+        :param depth: Bit depth or a surface whose pixel format is used.
+        :type depth: int or pygame.Surface
+        :param on_damage: Callable receiving every damaged rect, e.g. `SurfaceStackElement.mark_dirty`.
+        :type on_damage: callable
+        """
+        pygame.Surface.__init__(self, size, flags, depth)
+        self.draw = TrackedDraw(self)
+        self._on_damage = on_damage
+
+    def set_damage_callback(self, on_damage):
+        """
+        Sets the callable receiving every damaged rect.
+
+        :param on_damage: Callable receiving a `pygame.Rect`.
+        :type on_damage: callable
+        """
+        self._on_damage = on_damage
+
+    def mark_dirty(self, rect=None):
+        """
+        Reports an area as drawn into.
+
+        :param rect: The damaged area. Marks the whole surface if None.
+        :type rect: pygame.Rect
+        """
+        if self._on_damage is not None:
+            self._on_damage(rect)
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        rect = pygame.Surface.blit(self, source, dest, area, special_flags)
+        self.mark_dirty(rect)
+        return rect
+
+    def blits(self, blit_sequence, doreturn=1):
+        rects = pygame.Surface.blits(self, blit_sequence, doreturn=1)
+        for rect in rects:
+            self.mark_dirty(rect)
+        return rects if doreturn else None
+
+    def fill(self, color, rect=None, special_flags=0):
+        rect = pygame.Surface.fill(self, color, rect, special_flags)
+        self.mark_dirty(rect)
+        return rect
+
+    def set_at(self, position, color):
+        pygame.Surface.set_at(self, position, color)
+        self.mark_dirty(pygame.Rect(int(position[0]), int(position[1]), 1, 1))
+
 class SurfaceStackElement:
     """
     Represents an individual element in a stack of rendering surfaces.
@@ -12,6 +104,12 @@ class SurfaceStackElement:
     :type surface_render_position: tuple
     :var auto_fill: Indicates if the surface should auto-fill after rendering.
     :type auto_fill: bool
+    :var track_damage: If True, only the area reported via `mark_dirty` is drawn and cleared.
+    :type track_damage: bool
+    :var damage_rect: Area drawn into since the last clear, None if the surface is untouched.
+    :type damage_rect: pygame.Rect
+    :var is_static: If True, the surface is baked into a cached composite with its static neighbours.
+    :type is_static: bool
     """
     def __init__(self):
         """
@@ -22,6 +120,26 @@ class SurfaceStackElement:
         self.render_layer = 0
         self.surface_render_position = (0, 0)
         self.auto_fill = False
+        self.track_damage = False
+        self.damage_rect = None
+        self.is_static = False
+
+    def mark_dirty(self, rect=None):
+        """
+        Adds an area to the damage rect of the surface.
+        On static surfaces this triggers a rebuild of the cached composite.
+
+        :param rect: The area that was drawn into. Marks the whole surface if None.
+        :type rect: pygame.Rect
+        """
+        surface_rect = self.surface.get_rect()
+        rect = surface_rect if rect is None else surface_rect.clip(rect)
+        if rect.width == 0 or rect.height == 0:
+            return
+        if self.damage_rect is None:
+            self.damage_rect = pygame.Rect(rect)
+        else:
+            self.damage_rect.union_ip(rect)
 
     def print(self):
         """
@@ -29,6 +147,61 @@ class SurfaceStackElement:
         """
         print("Surface {} with layer: {}".format(self.name, self.render_layer))
 
+class StaticLayerComposite:
+    """
+    Cached composite of consecutive static elements of a `SurfaceStack`.
+    The elements are flattened with premultiplied alpha, so the composite blends exactly like the single layers.
+
+    :var elements: The baked elements in render order.
+    :type elements: list[SurfaceStackElement]
+    :var surface: The baked surface, None until the first build.
+    :type surface: pygame.Surface
+    :var position: Position of the baked surface in the window.
+    :type position: tuple
+    """
+    def __init__(self, elements):
+        """
+        Initializes a StaticLayerComposite.
+
+        :param elements: The static elements in render order.
+        :type elements: list[SurfaceStackElement]
+        """
+        self.elements = elements
+        self.surface = None
+        self.position = (0, 0)
+        self._positions = []
+
+    def needs_rebuild(self):
+        """
+        Checks if an element was marked dirty or moved since the last build.
+
+        :returns: True if the composite must be rebuilt.
+        :rtype: bool
+        """
+        if self.surface is None:
+            return True
+        for element, position in zip(self.elements, self._positions):
+            if element.damage_rect is not None or element.surface_render_position != position:
+                return True
+        return False
+
+    def rebuild(self):
+        """
+        Flattens all elements into one surface.
+        """
+        self._positions = [element.surface_render_position for element in self.elements]
+        bounds = pygame.Rect(self.elements[0].surface.get_rect(topleft=self._positions[0]))
+        for element, position in zip(self.elements, self._positions):
+            bounds.union_ip(element.surface.get_rect(topleft=position))
+        self.position = bounds.topleft
+        self.surface = pygame.Surface(bounds.size, pygame.SRCALPHA, 32)
+        for element, position in zip(self.elements, self._positions):
+            layer = element.surface
+            if not layer.get_flags() & pygame.SRCALPHA:
+                layer = layer.convert_alpha()
+            self.surface.blit(layer.premul_alpha(), (position[0] - bounds.x, position[1] - bounds.y), special_flags=pygame.BLEND_PREMULTIPLIED)
+            element.damage_rect = None
+
 class SurfaceStack:
     """
     Manages a stack of rendering surfaces for organized layer-based rendering.
@@ -37,9 +210,14 @@ class SurfaceStack:
         """
         Initializes a SurfaceStack.
         """
-        self._stack = []
+        self._stack = [] # elements sorted by render layer
+        self._render_layers = [] # sorted render layers, parallel to _stack for bisect lookups
+        self._elements = {} # name -> element
+        self._used_render_layers = set()
+        self._free_layer_hints = {} # requested render layer -> first layer that may be free, all below are taken
+        self._draw_plan = None # elements and static composites in render order, built lazily
 
-    def add_element(self, name, surface, render_layer: int, surface_render_position: tuple, fill_after_draw=True):
+    def add_element(self, name, surface, render_layer: int, surface_render_position: tuple, fill_after_draw=True, track_damage=False, static=False):
         """
         Adds a new surface element to the stack.
 
@@ -53,13 +231,18 @@ class SurfaceStack:
         :type surface_render_position: tuple
         :param fill_after_draw: Indicates if the surface should auto-fill after rendering.
         :type fill_after_draw: bool
+        :param track_damage: Draw and clear only the area marked via `SurfaceStackElement.mark_dirty`.
+                             A `TrackedSurface` reports its draw calls automatically.
+        :type track_damage: bool
+        :param static: Bake the surface into a cached composite with its static neighbours. The composite is
+                       rebuilt only after `SurfaceStackElement.mark_dirty`. Static surfaces are never auto-filled.
+        :type static: bool
         """
-        for element in self._stack:
-            if element.name == name:
-                s = "surface name \'{}\' already exists".format(name)
-                raise ValueError(s)
-            if element.render_layer == render_layer:
-                render_layer = render_layer + 1
+        if name in self._elements:
+            s = "surface name \'{}\' already exists".format(name)
+            raise ValueError(s)
+        render_layer = self._get_free_render_layer(render_layer)
+        index = bisect.bisect_left(self._render_layers, render_layer)
 
         surface_stack_element = SurfaceStackElement()
         surface_stack_element.name = name
@@ -67,8 +250,16 @@ class SurfaceStack:
         surface_stack_element.render_layer = render_layer
         surface_stack_element.surface_render_position = surface_render_position
         surface_stack_element.auto_fill = fill_after_draw
-        self._stack.append(surface_stack_element)
-        self._stack = sorted(self._stack, key=lambda x: x.render_layer, reverse=False)
+        surface_stack_element.track_damage = track_damage
+        surface_stack_element.is_static = static
+        if (track_damage or static) and isinstance(surface, TrackedSurface):
+            surface.set_damage_callback(surface_stack_element.mark_dirty)
+        # list.insert moves the following references with a single memmove, cheap next to the python level work
+        self._stack.insert(index, surface_stack_element)
+        self._render_layers.insert(index, render_layer)
+        self._used_render_layers.add(render_layer)
+        self._elements[name] = surface_stack_element
+        self._draw_plan = None
 
     def remove_element(self, name):
         """
@@ -77,10 +268,58 @@ class SurfaceStack:
         :param name: Name of the surface to remove.
         :type name: str
         """
+        element = self._elements.pop(name, None)
+        if element is None:
+            return
+        index = bisect.bisect_left(self._render_layers, element.render_layer)
+        if index >= len(self._stack) or self._stack[index] is not element: # render_layer was changed from outside
+            index = self._stack.index(element)
+        render_layer = self._render_layers[index] # the layer it was inserted at
+        del self._stack[index]
+        del self._render_layers[index]
+        self._used_render_layers.discard(render_layer)
+        for requested_layer, hint in self._free_layer_hints.items():
+            if requested_layer <= render_layer < hint:
+                self._free_layer_hints[requested_layer] = render_layer
+        self._draw_plan = None
+
+    def _get_free_render_layer(self, render_layer):
+        # a taken layer moves the element up to the next free one. Many elements requesting the same layer,
+        # e.g. one per unit, start at the hint of that layer instead of walking over all taken layers again
+        free_layer = self._free_layer_hints.get(render_layer, render_layer)
+        while free_layer in self._used_render_layers:
+            free_layer = free_layer + 1
+        self._free_layer_hints[render_layer] = free_layer + 1
+        return free_layer
+
+    def set_static(self, name, static=True):
+        """
+        Switches a surface element between static and dynamic rendering.
+
+        :param name: Name of the surface.
+        :type name: str
+        :param static: True to bake the surface into a cached composite.
+        :type static: bool
+        """
+        element = self.get_element(name)
+        element.is_static = static
+        if isinstance(element.surface, TrackedSurface):
+            element.surface.set_damage_callback(element.mark_dirty if static or element.track_damage else None)
+        self._draw_plan = None
+
+    def _build_draw_plan(self):
+        self._draw_plan = []
+        static_elements = []
         for element in self._stack:
-            if element.name == name:
-                self._stack.remove(element)
-                break
+            if element.is_static:
+                static_elements.append(element)
+                continue
+            if len(static_elements) > 0:
+                self._draw_plan.append(StaticLayerComposite(static_elements))
+                static_elements = []
+            self._draw_plan.append(element)
+        if len(static_elements) > 0:
+            self._draw_plan.append(StaticLayerComposite(static_elements))
 
     def get_surface(self, name):
         """
@@ -94,6 +333,15 @@ class SurfaceStack:
         """
         return self.get_element(name).surface
 
+    def get_elements(self):
+        """
+        Retrieves all SurfaceStackElements in render order.
+
+        :returns: The elements of the stack.
+        :rtype: list[SurfaceStackElement]
+        """
+        return list(self._stack)
+
     def get_element(self, name):
         """
         Retrieves a SurfaceStackElement by name.
@@ -104,24 +352,43 @@ class SurfaceStack:
         :returns: The requested element.
         :rtype: SurfaceStackElement:
         """
-        for element in self._stack:
-            if element.name == name:
-                return element
+        return self._elements.get(name)
 
     def draw(self, core):
         """
-        Draws all surfaces in the stack.
+        Draws all surfaces in the stack with a single `Surface.blits` call.
+
+        Elements with `track_damage` only submit their damage rect and are skipped
+        if nothing was drawn into them since the last clear. Consecutive static elements
+        are submitted as one cached `StaticLayerComposite`.
 
         :param core: Reference to the Core instance for rendering.
         :type core: Core
         """
-        counter = 0
+        if self._draw_plan is None:
+            self._build_draw_plan()
+        blit_sequence = []
+        for element in self._draw_plan:
+            if isinstance(element, StaticLayerComposite):
+                if element.needs_rebuild():
+                    element.rebuild()
+                blit_sequence.append((element.surface, element.position, None, pygame.BLEND_PREMULTIPLIED))
+            elif not element.track_damage:
+                blit_sequence.append((element.surface, element.surface_render_position))
+            elif element.damage_rect is not None:
+                area = element.damage_rect
+                position = (element.surface_render_position[0] + area.x, element.surface_render_position[1] + area.y)
+                blit_sequence.append((element.surface, position, area))
+        core.window.blits(blit_sequence, doreturn=False)
+
         for element in self._stack:
-            # print("Draw {} at {} by {}/{}]".format(element.name, element.surface_render_position, counter, len(self.stack)-1))
-            core.window.blit(element.surface, element.surface_render_position)
-            if element.auto_fill:
+            if not element.auto_fill or element.is_static:
+                continue
+            if not element.track_damage:
                 element.surface.fill(core.background_color)
-            counter = counter + 1
+            elif element.damage_rect is not None:
+                pygame.Surface.fill(element.surface, core.background_color, element.damage_rect)
+                element.damage_rect = None
 
     def print(self):
         """
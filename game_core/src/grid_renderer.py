@@ -0,0 +1,103 @@
+from .core import *
+import numpy as np
+
+class GridRenderer:
+    """
+    Draws a 2D grid of cell values, e.g. materials or tile indices, with a few NumPy operations instead of
+    one ``pygame.draw.rect`` per cell. The values are mapped through a color lookup table, written into a
+    surface with one pixel per cell via ``pygame.surfarray`` and scaled up by the cell size (nearest neighbour).
+
+    Arrays are indexed as ``values[x, y]``, the layout of ``pygame.surfarray``. Pass ``grid.T`` for arrays of rows.
+
+    .. code-block:: python
+
+        renderer = GridRenderer([(0, 0, 0, 0), (194, 178, 128), (64, 164, 223, 150)], cell_size=3)
+        renderer.render(materials, self.surface)
+    """
+    def __init__(self, palette, cell_size=1):
+        """
+        Initializes the renderer.
+
+        :param palette: Colors indexed by cell value, a list or a dictionary with integer keys. Colors are RGB or RGBA tuples.
+        :param cell_size: Size of a cell in pixels as (width, height) or a single value.
+        :raises ValueError: If the palette is empty.
+        """
+        if isinstance(palette, dict):
+            colors = [(0, 0, 0, 0)] * (max(palette.keys()) + 1) if len(palette) > 0 else []
+            for index, color in palette.items():
+                colors[index] = color
+        else:
+            colors = list(palette)
+        if len(colors) == 0:
+            raise ValueError("palette can't be empty")
+        self._lut = np.array([tuple(color) + (255,) * (4 - len(color)) for color in colors], dtype=np.uint8)
+        self.cell_size = tuple(cell_size) if isinstance(cell_size, (tuple, list)) else (cell_size, cell_size)
+        self._has_alpha = bool((self._lut[:, 3] < 255).any())
+        self._cell_surface = None
+        self._surface = None
+
+    def get_colors(self, values) -> np.ndarray:
+        """
+        Maps cell values through the palette, e.g. to modify the colors before `render_colors`.
+
+        :param values: Integer array of cell values.
+        :return: ``uint8`` array with an RGBA color per cell.
+        """
+        return self._lut[values]
+
+    def render(self, values, surface: pygame.Surface = None, position=(0, 0)) -> pygame.Surface:
+        """
+        Draws a grid of cell values.
+
+        :param values: Integer array of shape (cells x, cells y).
+        :param surface: Target surface, blitted at `position`. Nothing is blitted if None.
+        :param position: Position of the grid on the target surface.
+        :return: The rendered grid surface, reused by the next call.
+        """
+        return self.render_colors(self._lut[values], surface, position)
+
+    def render_colors(self, colors, surface: pygame.Surface = None, position=(0, 0)) -> pygame.Surface:
+        """
+        Draws a grid of colors.
+
+        :param colors: ``uint8`` array of shape (cells x, cells y, 3) or (cells x, cells y, 4).
+        :param surface: Target surface, blitted at `position`. Nothing is blitted if None.
+        :param position: Position of the grid on the target surface.
+        :return: The rendered grid surface, reused by the next call.
+        """
+        has_alpha = colors.shape[2] == 4 and (self._has_alpha or bool((colors[:, :, 3] < 255).any()))
+        cell_surface = self._get_cell_surface(colors.shape[:2], has_alpha)
+        if has_alpha:
+            pixels = pygame.surfarray.pixels3d(cell_surface)
+            pixels[...] = colors[:, :, :3]
+            del pixels
+            alpha = pygame.surfarray.pixels_alpha(cell_surface)
+            alpha[...] = colors[:, :, 3]
+            del alpha
+        else:
+            pygame.surfarray.blit_array(cell_surface, colors[:, :, :3])
+
+        if self.cell_size == (1, 1):
+            self._surface = cell_surface
+        else:
+            size = (colors.shape[0] * self.cell_size[0], colors.shape[1] * self.cell_size[1])
+            if self._surface is None or self._surface.get_size() != size or self._surface.get_flags() != cell_surface.get_flags():
+                self._surface = pygame.transform.scale(cell_surface, size)
+            else:
+                pygame.transform.scale(cell_surface, size, self._surface)
+        if surface is not None:
+            surface.blit(self._surface, position)
+        return self._surface
+
+    def get_surface(self) -> pygame.Surface:
+        """
+        :return: The surface of the last render or None.
+        """
+        return self._surface
+
+    def _get_cell_surface(self, size, has_alpha):
+        size = (int(size[0]), int(size[1]))
+        if self._cell_surface is None or self._cell_surface.get_size() != size or bool(self._cell_surface.get_flags() & pygame.SRCALPHA) != has_alpha:
+            self._cell_surface = pygame.Surface(size, pygame.SRCALPHA, 32) if has_alpha else pygame.Surface(size, 0, 32)
+            self._surface = None
+        return self._cell_surface
@@ -0,0 +1,134 @@
+import numpy as np
+
+_GRADIENT_COUNT = 256
+_GRADIENT_ANGLES = np.arange(_GRADIENT_COUNT) * (2.0 * np.pi / _GRADIENT_COUNT)
+_GRADIENTS_X = np.cos(_GRADIENT_ANGLES)
+_GRADIENTS_Y = np.sin(_GRADIENT_ANGLES)
+
+_HASH_X = np.uint64(0x9E3779B97F4A7C15)
+_HASH_Y = np.uint64(0xC2B2AE3D27D4EB4F)
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+
+class GradientNoise:
+    """
+    Seeded 2D gradient (Perlin) noise evaluated with NumPy, a whole array of coordinates per call.
+    The lattice gradients are hashed from the seed and the integer coordinates instead of drawn from a
+    random state, so a value only depends on its coordinates: chunks generated in any order, on any thread
+    or in another run with the same seed match each other and chunks cached on disk.
+
+    With one octave the values lie in about [-0.7, 0.7] like ``perlin_noise.PerlinNoise``, more octaves are
+    normalized by their total amplitude.
+
+    .. code-block:: python
+
+        noise = GradientNoise(seed=42, octaves=4)
+        values = noise.fill((chunk_x * 64 * step, chunk_y * 64 * step), (64, 64), step) # values[x, y]
+    """
+    def __init__(self, seed=0, octaves=1, frequency=1.0, persistence=0.5, lacunarity=2, period=None):
+        """
+        Initializes the noise.
+
+        :param seed: Integer seed.
+        :param octaves: Number of summed noise layers.
+        :param frequency: Lattice cells per coordinate unit of the first octave.
+        :param persistence: Amplitude factor from one octave to the next.
+        :param lacunarity: Frequency factor from one octave to the next, an integer for tileable noise.
+        :param period: Coordinate units after which the noise repeats in both axes as (x, y) or a single value, not tileable if None.
+            ``period * frequency`` must be a whole number of lattice cells.
+        :raises ValueError: If the octaves or the tiling parameters are invalid.
+        """
+        if octaves < 1:
+            raise ValueError("octaves must be at least 1, got {}".format(octaves))
+        if period is not None:
+            period = tuple(period) if isinstance(period, (tuple, list)) else (period, period)
+            for value in period:
+                if value <= 0 or not float(value * frequency).is_integer():
+                    raise ValueError("period * frequency must be a positive whole number, got {}".format(value * frequency))
+            if octaves > 1 and not float(lacunarity).is_integer():
+                raise ValueError("lacunarity must be an integer for tileable noise, got {}".format(lacunarity))
+        self.seed = int(seed)
+        self.octaves = int(octaves)
+        self.frequency = frequency
+        self.persistence = persistence
+        self.lacunarity = lacunarity
+        self.period = period
+
+    def sample(self, x, y) -> np.ndarray:
+        """
+        Evaluates the noise at the given coordinates.
+
+        :param x: X coordinates, a number or an array broadcastable with `y`.
+        :param y: Y coordinates.
+        :return: ``float64`` array of the broadcast shape.
+        """
+        x, y = np.broadcast_arrays(np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64))
+        result = np.zeros(x.shape, dtype=np.float64)
+        frequency = self.frequency
+        amplitude = 1.0
+        total_amplitude = 0.0
+        for octave in range(self.octaves):
+            lattice_period = None
+            if self.period is not None:
+                lattice_period = (int(round(self.period[0] * frequency)), int(round(self.period[1] * frequency)))
+            result += self._sample_octave(x * frequency, y * frequency, self._get_octave_seed(octave), lattice_period) * amplitude
+            total_amplitude = total_amplitude + amplitude
+            frequency = frequency * self.lacunarity
+            amplitude = amplitude * self.persistence
+        if total_amplitude != 1.0:
+            result /= total_amplitude
+        return result
+
+    def fill(self, origin, size, step=1.0) -> np.ndarray:
+        """
+        Evaluates the noise on a regular grid, e.g. one value per cell of a map chunk.
+
+        :param origin: Coordinates (x, y) of the first value.
+        :param size: Number of values (width, height).
+        :param step: Coordinate distance between neighbouring values, as (x, y) or a single value.
+        :return: ``float64`` array of shape (width, height) indexed as ``values[x, y]``, the layout of ``pygame.surfarray``.
+        """
+        step_x, step_y = tuple(step) if isinstance(step, (tuple, list)) else (step, step)
+        xs = origin[0] + np.arange(size[0], dtype=np.float64) * step_x
+        ys = origin[1] + np.arange(size[1], dtype=np.float64) * step_y
+        return self.sample(xs[:, np.newaxis], ys[np.newaxis, :])
+
+    def _get_octave_seed(self, octave):
+        # every octave gets its own gradients, otherwise the lattice points of all octaves line up
+        return np.uint64((self.seed * 1000003 + octave * 7919) & 0xFFFFFFFFFFFFFFFF)
+
+    def _sample_octave(self, x, y, seed, lattice_period):
+        cell_x = np.floor(x)
+        cell_y = np.floor(y)
+        offset_x = x - cell_x
+        offset_y = y - cell_y
+        x0 = cell_x.astype(np.int64)
+        y0 = cell_y.astype(np.int64)
+        x1 = x0 + 1
+        y1 = y0 + 1
+        if lattice_period is not None:
+            x0, x1 = x0 % lattice_period[0], x1 % lattice_period[0]
+            y0, y1 = y0 % lattice_period[1], y1 % lattice_period[1]
+
+        n00 = self._dot_gradient(x0, y0, seed, offset_x, offset_y)
+        n10 = self._dot_gradient(x1, y0, seed, offset_x - 1.0, offset_y)
+        n01 = self._dot_gradient(x0, y1, seed, offset_x, offset_y - 1.0)
+        n11 = self._dot_gradient(x1, y1, seed, offset_x - 1.0, offset_y - 1.0)
+
+        fade_x = offset_x * offset_x * offset_x * (offset_x * (offset_x * 6.0 - 15.0) + 10.0)
+        fade_y = offset_y * offset_y * offset_y * (offset_y * (offset_y * 6.0 - 15.0) + 10.0)
+        top = n00 + (n10 - n00) * fade_x
+        bottom = n01 + (n11 - n01) * fade_x
+        return top + (bottom - top) * fade_y
+
+    def _dot_gradient(self, lattice_x, lattice_y, seed, offset_x, offset_y):
+        # splitmix64 finalizer over the lattice coordinates, the products wrap around in uint64
+        with np.errstate(over="ignore"):
+            h = (lattice_x.astype(np.uint64) * _HASH_X) ^ (lattice_y.astype(np.uint64) * _HASH_Y) ^ seed
+            h ^= h >> np.uint64(30)
+            h *= _MIX_1
+            h ^= h >> np.uint64(27)
+            h *= _MIX_2
+            h ^= h >> np.uint64(31)
+        index = (h & np.uint64(_GRADIENT_COUNT - 1)).astype(np.intp)
+        return _GRADIENTS_X[index] * offset_x + _GRADIENTS_Y[index] * offset_y
@@ -1,4 +1,7 @@
 from .core import *
+from .atlas import TextureAtlas
+from .sprite_cache import SpriteCache
+from .asset_manager import AssetLoader, AssetManager, FrameTransform, TransformCache
 import os
 
 ####################
@@ -20,6 +23,38 @@ class Slicer:
         """
         return surface
 
+    def get_rects(self, surface: pygame.Surface):
+        """
+        Returns the areas of the tiles within the surface.
+
+        :param surface: A `pygame.Surface` object to be sliced.
+        :return: A list of `pygame.Rect` areas.
+        """
+        return [surface.get_rect()]
+
+    def get_config(self):
+        """
+        Returns a hashable description of the slicing parameters, used as cache key.
+
+        :return: A tuple of the slicer class name and its parameters.
+        """
+        return (self.__class__.__name__,)
+
+    def _cut(self, surface: pygame.Surface, rect: pygame.Rect):
+        """
+        Returns a tile as subsurface sharing the pixels of the source.
+        Tiles reaching out of the source are copied onto a transparent surface instead.
+
+        :param surface: The source surface.
+        :param rect: The area of the tile.
+        :return: A `pygame.Surface` tile.
+        """
+        if surface.get_rect().contains(rect):
+            return surface.subsurface(rect)
+        tile = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA, 32)
+        tile.blit(surface, (0, 0), rect)
+        return tile
+
 
 class SizeSlicer(Slicer):
     """
@@ -61,13 +96,31 @@ class SizeSlicer(Slicer):
         Splits the surface into tiles based on the specified size and gaps.
 
         :param surface: A `pygame.Surface` to be sliced.
-        :return: A list of `pygame.Surface` tiles.
+        :return: A list of `pygame.Surface` tiles, subsurfaces of the source.
+        """
+        return [self._cut(surface, rect) for rect in self.get_rects(surface)]
+
+    def get_config(self):
+        """
+        Returns a hashable description of the slicing parameters, used as cache key.
+
+        :return: A tuple of the slicer class name and its parameters.
+        """
+        return (self.__class__.__name__, self._width, self._height, self._x_gap, self._y_gap,
+                self._top_padding, self._left_padding, self._right_padding, self._bottom_padding)
+
+    def get_rects(self, surface: pygame.Surface):
+        """
+        Returns the areas of the tiles based on the specified size and gaps.
+
+        :param surface: A `pygame.Surface` to be sliced.
+        :return: A list of `pygame.Rect` areas.
         """
         width, height = surface.get_width(), surface.get_height()
         animation_content_rect = pygame.Rect(self._left_padding, self._top_padding, width - self._right_padding, height - self._bottom_padding)
         cols = round((animation_content_rect.width - animation_content_rect.x) / self._width)
         rows = round((animation_content_rect.height - animation_content_rect.y) / self._height)
-        image_tiles = []
+        tile_rects = []
         for y in range(rows):
             for x in range(cols):
                 selection_rect = pygame.Rect(
@@ -76,10 +129,8 @@ class SizeSlicer(Slicer):
                     self._width - self._x_gap,
                     self._height - self._y_gap
                 )
-                tile = pygame.Surface((selection_rect.width, selection_rect.height), pygame.SRCALPHA, 32)
-                tile.blit(surface, (0, 0), selection_rect)
-                image_tiles.append(tile)
-        return image_tiles
+                tile_rects.append(selection_rect)
+        return tile_rects
 
 class AmountSlicer(Slicer):
     """
@@ -122,7 +173,25 @@ class AmountSlicer(Slicer):
         Splits the surface into a grid of tiles based on the number of rows and columns.
 
         :param surface: A `pygame.Surface` to be sliced.
-        :return: A list of `pygame.Surface` tiles.
+        :return: A list of `pygame.Surface` tiles, subsurfaces of the source.
+        """
+        return [self._cut(surface, rect) for rect in self.get_rects(surface)]
+
+    def get_config(self):
+        """
+        Returns a hashable description of the slicing parameters, used as cache key.
+
+        :return: A tuple of the slicer class name and its parameters.
+        """
+        return (self.__class__.__name__, self._rows, self._cols, self._x_gap, self._y_gap,
+                self._top_padding, self._left_padding, self._right_padding, self._bottom_padding)
+
+    def get_rects(self, surface: pygame.Surface):
+        """
+        Returns the areas of the tiles based on the number of rows and columns.
+
+        :param surface: A `pygame.Surface` to be sliced.
+        :return: A list of `pygame.Rect` areas.
         """
         width, height = surface.get_width(), surface.get_height()
         animation_content_rect = pygame.Rect(self._left_padding, self._top_padding, width - self._right_padding, height - self._bottom_padding)
@@ -130,7 +199,7 @@ class AmountSlicer(Slicer):
             (animation_content_rect.width - animation_content_rect.x) / self._cols,
             (animation_content_rect.height - animation_content_rect.y) / self._rows
         )
-        image_tiles = []
+        tile_rects = []
         for y in range(self._rows):
             for x in range(self._cols):
                 selection_rect = pygame.Rect(
@@ -139,11 +208,9 @@ class AmountSlicer(Slicer):
                     animation_frame_size[0] - self._x_gap,
                     animation_frame_size[1] - self._y_gap
                 )
-                tile = pygame.Surface((selection_rect.width, selection_rect.height), pygame.SRCALPHA, 32)
-                tile.blit(surface, (0, 0), selection_rect)
-                image_tiles.append(tile)
+                tile_rects.append(selection_rect)
 
-        return image_tiles
+        return tile_rects
 
 ############################################
 ### Simple color and image loader sprite ###
@@ -202,17 +269,28 @@ class SimpleImageSprite(pygame.sprite.Sprite):
     """
     A sprite that displays an image, optionally sliced by a Slicer object.
     """
-    def __init__(self, image_path, slicer: Slicer = None):
+    def __init__(self, image_path, slicer: Slicer = None, image: pygame.Surface = None, assets: AssetManager = None):
         """
         Initializes the sprite with an image and an optional slicer.
 
         :param image_path: Path to the image file.
         :param slicer: An optional Slicer object to slice the image.
+        :param image: An already loaded image, e.g. from an `AssetLoader`. `image_path` is not loaded if set.
+        :param assets: An optional AssetManager, e.g. `core.get_asset_manager()`. The image and its flipped
+            variants are then shared with other sprites of the same path and the image has to be given back with `release`.
         """
         pygame.sprite.Sprite.__init__(self)
         self._slicer = slicer
-        self._image = pygame.image.load(image_path).convert_alpha()
+        self._asset_handle = None
+        if image is None and assets is not None:
+            self._asset_handle = assets.acquire(image_path)
+            image = self._asset_handle.get()
+        self._image = image if image is not None else pygame.image.load(image_path).convert_alpha()
+        self._transform = FrameTransform()
+        self._transform_cache = assets.get_transform_cache() if assets is not None else TransformCache()
         self._rect = self._image.get_rect()
+        self._tiles = None # sliced tiles of _image, computed once per slicer config
+        self._tiles_config = None
 
     def flip(self, flip_x=False, flip_y=False):
         """
@@ -221,17 +299,49 @@ class SimpleImageSprite(pygame.sprite.Sprite):
         :param flip_x: If True, flip the image horizontally.
         :param flip_y: If True, flip the image vertically.
         """
-        self._image = pygame.transform.flip(self._image, flip_x, flip_y)
+        self.set_transform(self._transform._replace(flip_x=self._transform.flip_x != bool(flip_x), flip_y=self._transform.flip_y != bool(flip_y)))
+
+    def set_transform(self, transform: FrameTransform):
+        """
+        Sets the transform of the image. The source image stays untouched, the transformed variant is
+        computed once and shared through the transform cache.
+
+        :param transform: The transform, e.g. `FrameTransform(flip_x=True, rotation=90)`.
+        """
+        self._transform = transform if transform is not None else FrameTransform()
+        self._tiles = None
+
+    def get_transform(self) -> FrameTransform:
+        """
+        Returns the transform of the image.
+
+        :return: The `FrameTransform`.
+        """
+        return self._transform
+
+    def release(self):
+        """
+        Gives the image back to the AssetManager it was acquired from. Does nothing for directly loaded images.
+        """
+        if self._asset_handle is not None:
+            self._asset_handle.release()
+            self._asset_handle = None
 
     def get_image(self) -> pygame.Surface:
         """
-        Returns the image or a sliced version of it.
+        Returns the image or a sliced version of it. Tiles are sliced once and cached until the image
+        is flipped or the slicer config changes.
 
         :return: A `pygame.Surface` or list of surfaces if sliced.
         """
+        image = self._transform_cache.get(self._image, self._transform)
         if self._slicer is not None:
-            return self._slicer.slice(self._image)
-        return self._image
+            config = self._slicer.get_config()
+            if self._tiles is None or self._tiles_config != config:
+                self._tiles = self._slicer.slice(image)
+                self._tiles_config = config
+            return list(self._tiles) if isinstance(self._tiles, list) else self._tiles
+        return image
 
     def get_rect(self) -> pygame.Rect:
         """
@@ -254,30 +364,225 @@ class SimpleImageSprite(pygame.sprite.Sprite):
 ### Simple animator ###
 #######################
 
+class SpriteAnimationClips:
+    """
+    Shared, read-only animation data: the frames of every state scaled to one sprite size.
+    One instance can be shared by any number of animated entities, each with its own `SpriteAnimationPlayback`.
+
+    .. code-block:: python
+
+        clips = SpriteAnimationClips(anim_sprites, sprite_size=(32, 32), fps=1)
+        playbacks = [clips.create_playback("idle") for _ in range(500)]
+        ...
+        frame = playbacks[i].play(clips, "run", self.core.delta_time, transform=FrameTransform(flip_x=True))
+
+    Transformed frames, e.g. mirrored for a character facing left, are computed on first use and shared
+    through the transform cache instead of being added as extra states.
+
+    :var frame_time: Time a frame is shown.
+    :type frame_time: float
+    :var empty_frame: Transparent frame returned for unknown states.
+    :type empty_frame: pygame.Surface
+    """
+    def __init__(self, anim_sprites: dict, sprite_size: tuple, fps=30, transform_cache: TransformCache = None):
+        """
+        Initializes the clips.
+
+        :param anim_sprites: Dictionary mapping states to animation frames. A frame can be a list of layers.
+        :param sprite_size: Size of the frames.
+        :param fps: Frames per second for the animation.
+        :param transform_cache: Cache for transformed frames, e.g. `AssetManager.get_transform_cache()`. A private one if None.
+        """
+        self._animation_sprites = anim_sprites
+        self._transform_cache = transform_cache if transform_cache is not None else TransformCache()
+        self._sprite_size = tuple(sprite_size)
+        self._frames = {} # state -> frames scaled to sprite_size, built on first use
+        self.frame_time = 60/fps
+        self.empty_frame = pygame.surface.Surface(self._sprite_size, pygame.SRCALPHA, 32).convert_alpha()
+
+    def get_size(self):
+        """
+        Returns the size of the frames.
+
+        :return: Tuple representing the size (width, height).
+        """
+        return self._sprite_size
+
+    def has_state(self, anim_state):
+        """
+        Checks if an animation state exists.
+
+        :param anim_state: The animation state.
+        :return: True if the state exists.
+        """
+        return anim_state in self._animation_sprites
+
+    def get_frames(self, anim_state):
+        """
+        Returns the frames of a state scaled to the frame size, multi-layer frames are composited.
+
+        :param anim_state: The animation state.
+        :return: A list of `pygame.Surface` frames.
+        """
+        frames = self._frames.get(anim_state)
+        if frames is None:
+            frames = [self._prepare_frame(sprite) for sprite in self._animation_sprites[anim_state]]
+            self._frames[anim_state] = frames
+        return frames
+
+    def get_frame(self, anim_state, index, transform: FrameTransform = None):
+        """
+        Returns a single frame, or `empty_frame` if the state is unknown or the index is negative.
+
+        :param anim_state: The animation state.
+        :param index: The frame index.
+        :param transform: An optional transform of the frame, computed once and cached.
+        :return: A `pygame.Surface` frame.
+        """
+        if index < 0 or anim_state not in self._animation_sprites:
+            return self._transform_cache.get(self.empty_frame, transform)
+        return self._transform_cache.get(self.get_frames(anim_state)[index], transform)
+
+    def create_playback(self, start_state):
+        """
+        Creates the playback state for one animated entity.
+
+        :param start_state: The initial animation state.
+        :return: A new `SpriteAnimationPlayback`.
+        """
+        return SpriteAnimationPlayback(start_state)
+
+    def clear_frame_cache(self):
+        """
+        Drops the scaled frames, required after `anim_sprites` was changed.
+        """
+        self._frames = {}
+
+    def get_transform_cache(self) -> TransformCache:
+        """
+        Returns the cache holding the transformed frames.
+
+        :return: The `TransformCache`.
+        """
+        return self._transform_cache
+
+    def _prepare_frame(self, sprite):
+        size = self._sprite_size
+        if type(sprite) is list:
+            frame = pygame.surface.Surface(size, pygame.SRCALPHA, 32).convert_alpha()
+            for layer in sprite:
+                frame.blit(layer if layer.get_size() == size else pygame.transform.scale(layer, size), (0, 0))
+            return frame
+        if sprite.get_size() == size:
+            return sprite
+        return pygame.transform.scale(sprite, size)
+
+class SpriteAnimationPlayback:
+    """
+    Playback state of one animated entity. Holds no surfaces, the frames are looked up in shared `SpriteAnimationClips`.
+
+    :var state: The active animation state.
+    :type state: str
+    :var frame_index: Index of the shown frame, -1 if no frame is shown.
+    :type frame_index: int
+    :var time_left: Time until the next frame is due.
+    :type time_left: float
+    """
+    __slots__ = ("state", "frame_index", "time_left")
+
+    def __init__(self, start_state):
+        """
+        Initializes the playback.
+
+        :param start_state: The initial animation state.
+        """
+        self.state = start_state
+        self.frame_index = -1
+        self.time_left = 0
+
+    def tick(self, clips: SpriteAnimationClips, delta_time):
+        """
+        Counts down the frame time.
+
+        :param clips: The clips played.
+        :param delta_time: Time since the last frame.
+        :return: True if the next frame is due.
+        """
+        self.time_left = self.time_left - delta_time
+        if self.time_left <= 0:
+            self.time_left = clips.frame_time
+            return True
+        return False
+
+    def step(self, clips: SpriteAnimationClips, anim_state, transform: FrameTransform = None):
+        """
+        Shows the next frame of a state, a changed state starts at its first frame.
+
+        :param clips: The clips played.
+        :param anim_state: The animation state.
+        :param transform: An optional transform of the frame.
+        :return: A `pygame.Surface` of the shown frame.
+        """
+        if not clips.has_state(anim_state):
+            print("animation state '{}' not found".format(anim_state))
+            self.frame_index = -1
+            return clips.get_frame(anim_state, -1, transform)
+        if anim_state != self.state:
+            self.state = anim_state
+            self.frame_index = 0
+        else:
+            self.frame_index = (self.frame_index + 1) % len(clips.get_frames(anim_state))
+        return clips.get_frame(self.state, self.frame_index, transform)
+
+    def get_frame(self, clips: SpriteAnimationClips, transform: FrameTransform = None):
+        """
+        Returns the shown frame.
+
+        :param clips: The clips played.
+        :param transform: An optional transform of the frame.
+        :return: A `pygame.Surface` of the shown frame.
+        """
+        return clips.get_frame(self.state, self.frame_index, transform)
+
+    def play(self, clips: SpriteAnimationClips, anim_state, delta_time=None, transform: FrameTransform = None):
+        """
+        Advances the playback if a frame is due and returns the shown frame.
+
+        :param clips: The clips played.
+        :param anim_state: The animation state.
+        :param delta_time: Time since the last frame. Without it every call shows the next frame.
+        :param transform: An optional transform of the frame.
+        :return: A reference to a shared `pygame.Surface` frame.
+        """
+        if delta_time is not None and not self.tick(clips, delta_time):
+            return self.get_frame(clips, transform)
+        return self.step(clips, anim_state, transform)
+
 class SimpleSpriteAnimator:
     """
     Manages animation states for sprites and cycles through frames based on time.
     """
-    def __init__(self, anim_sprites: dict, start_state: str, anim_state_decision: callable, sprite_size: tuple, fps=30):
+    def __init__(self, anim_sprites: dict = None, start_state: str = None, anim_state_decision: callable = None, sprite_size: tuple = None, fps=30, clips: SpriteAnimationClips = None):
         """
         Initializes the animator with animations, state logic, and frame timing.
 
-        :param anim_sprites: Dictionary mapping states to animation frames.
+        :param anim_sprites: Dictionary mapping states to animation frames, not needed with `clips`.
         :param start_state: The initial animation state.
         :param anim_state_decision: Callable to decide the current state.
-        :param sprite_size: Size of the animation surface.
+        :param sprite_size: Size of the animation surface, not needed with `clips`.
         :param fps: Frames per second for the animation.
-        """
-        ground_surface = pygame.surface.Surface(sprite_size, pygame.SRCALPHA, 32)
-        self._surface = ground_surface.convert_alpha()
-        self._rect = self._surface.get_rect()
-        self._animation_sprites = anim_sprites
-        self._active_sprite_index = 0
-        self._active_animation_state = start_state
+        :param clips: Shared clips, replaces `anim_sprites`, `sprite_size` and `fps` if set.
+        :raises ValueError: If `start_state` or `anim_state_decision` is missing, or neither `clips` nor `anim_sprites` and `sprite_size` are given.
+        """
+        if start_state is None or anim_state_decision is None:
+            raise ValueError("start_state and anim_state_decision are required")
+        if clips is None and (anim_sprites is None or sprite_size is None):
+            raise ValueError("either clips or anim_sprites and sprite_size are required")
+        self._clips = clips if clips is not None else SpriteAnimationClips(anim_sprites, sprite_size, fps)
+        self._playback = self._clips.create_playback(start_state)
+        self._rect = pygame.Rect((0, 0), self._clips.get_size())
         self._cb_anim_state_decision = anim_state_decision
-        self._fps = fps
-        self._ft = 60/self._fps
-        self._fwaiter = 0
+        self._transform = None
 
     def get_size(self):
         """
@@ -285,7 +590,15 @@ class SimpleSpriteAnimator:
 
         :return: Tuple representing the size (width, height).
         """
-        return self._surface.get_size()
+        return self._clips.get_size()
+
+    def get_clips(self):
+        """
+        Returns the clips, which can be shared with other animators.
+
+        :return: The `SpriteAnimationClips`.
+        """
+        return self._clips
 
     def get_image(self, delta_time=None):
         """
@@ -319,34 +632,24 @@ class SimpleSpriteAnimator:
         :param delta_time: Time since the last frame, used for timing animations.
         :return: A `pygame.Surface` of the current frame.
         """
-        if delta_time is not None:
-            self._fwaiter = self._fwaiter - delta_time
-            if self._fwaiter <= 0:
-                self._fwaiter = self._ft
-            else:
-                return self._surface
-        self._surface.fill((0, 0, 0, 0))
-        anim_state = self._cb_anim_state_decision()
-        if anim_state not in self._animation_sprites:
-            print("animation state '{}' not found".format(anim_state))
-            return self._surface
-        if anim_state != self._active_animation_state:
-            self._active_sprite_index = 0
-            self._active_animation_state = anim_state
-
-        active_sprite = self._animation_sprites[self._active_animation_state][self._active_sprite_index]
+        if delta_time is not None and not self._playback.tick(self._clips, delta_time):
+            return self._playback.get_frame(self._clips, self._transform)
+        return self._playback.step(self._clips, self._cb_anim_state_decision(), self._transform)
 
-        if type(active_sprite) is list:
-            for sprite in active_sprite:
-                self._surface.blit(pygame.transform.scale(sprite, self.get_size()), (0, 0))
-        else:
-            self._surface.blit(pygame.transform.scale(active_sprite, self.get_size()), (0, 0))
+    def set_transform(self, transform: FrameTransform):
+        """
+        Sets the transform of the returned frames, e.g. `FrameTransform(flip_x=True)` for a character facing left.
+        Each transformed frame is computed once and shared through the transform cache of the clips.
 
-        self._active_sprite_index = self._active_sprite_index + 1
-        if self._active_sprite_index >= len(self._animation_sprites[self._active_animation_state]):
-            self._active_sprite_index = 0
+        :param transform: The transform or None.
+        """
+        self._transform = transform
 
-        return self._surface
+    def clear_frame_cache(self):
+        """
+        Drops the scaled frames, required after `anim_sprites` was changed.
+        """
+        self._clips.clear_frame_cache()
 
 ###############################################
 ### Directory structure to animation parser ###
@@ -356,16 +659,26 @@ class SpriteDirectoryAnimation:
     """
     Parses a directory structure to create animations for sprites.
     """
-    def __init__(self, project_path, slicer: Slicer = None):
+    def __init__(self, project_path, slicer: Slicer = None, atlas: TextureAtlas = None, cache: SpriteCache = None, loader: AssetLoader = None):
         """
         Initializes the parser with a project directory and an optional slicer.
 
         :param project_path: Path to the directory containing animations.
         :param slicer: An optional Slicer object to slice images.
         :type slicer: Slicer
+        :param atlas: An optional atlas the parsed frames are packed into.
+        :type atlas: TextureAtlas
+        :param cache: An optional on-disk cache. On a cache hit no image is decoded, the frames are
+                      loaded on their cached sheets or atlas pages and `atlas` stays untouched.
+        :type cache: SpriteCache
+        :param loader: An optional loader that decodes the images of a directory in parallel.
+        :type loader: AssetLoader
         """
         self._project_path = project_path
         self._slicer = slicer
+        self._atlas = atlas
+        self._cache = cache
+        self._loader = loader
 
     def parse(self) -> dict[str, pygame.Surface]:
         """
@@ -373,13 +686,25 @@ class SpriteDirectoryAnimation:
 
         :return: A dictionary mapping animation names to frames.
         """
+        cache_key = None
+        if self._cache is not None and os.path.exists(self._project_path):
+            cache_key = self._cache.get_key(self._project_path, slicer=self._slicer, atlas=self._atlas)
+            anim = self._cache.load(self._project_path, cache_key)
+            if anim is not None:
+                return anim
+
+        anim = {}
         if os.path.isfile(self._project_path):
-            return {self._convert_filename(os.path.basename(self._project_path)): SimpleImageSprite(self._project_path, slicer=self._slicer).get_image()}
+            anim = {self._convert_filename(os.path.basename(self._project_path)): SimpleImageSprite(self._project_path, slicer=self._slicer).get_image()}
         elif os.path.isdir(self._project_path):
-            return self._build()
+            anim = self._build()
         else:
             print("path '{}' not valid".format(self._project_path))
-        return {}
+        if self._atlas is not None:
+            anim = self._atlas.pack_animation(anim)
+        if cache_key is not None:
+            self._cache.save(self._project_path, cache_key, anim)
+        return anim
 
     def _convert_filename(self, filename):
         """
@@ -396,22 +721,37 @@ class SpriteDirectoryAnimation:
 
         :return: A dictionary mapping animation names to frames.
         """
-        anim = {}
-        animation_files = os.listdir(self._project_path)
-        for animation_filename in animation_files:
+        animation_paths = [] # (animation name, is single file, frame paths)
+        for animation_filename in os.listdir(self._project_path):
             absolute_animation_path = os.path.join(self._project_path, animation_filename)
             animation_name = self._convert_filename(animation_filename)
-            anim[animation_name] = []
             if os.path.isfile(absolute_animation_path):
-                anim[animation_name] = SimpleImageSprite(absolute_animation_path, slicer=self._slicer).get_image()
+                animation_paths.append((animation_name, True, [absolute_animation_path]))
             elif os.path.isdir(absolute_animation_path):
-                for frame_filename in os.listdir(absolute_animation_path):
-                    if os.path.isfile(os.path.join(absolute_animation_path, frame_filename)):
-                        next_frames = SimpleImageSprite(os.path.join(absolute_animation_path, frame_filename), slicer=self._slicer).get_image()
-                        current_frame = anim[animation_name]
-                        if next_frames is not None:
-                            if type(next_frames) is list:
-                                anim[animation_name] = [*current_frame, *next_frames]
-                            else:
-                                anim[animation_name].append(next_frames)
-        return anim
\ No newline at end of file
+                frame_paths = [os.path.join(absolute_animation_path, frame_filename) for frame_filename in os.listdir(absolute_animation_path)]
+                animation_paths.append((animation_name, False, [frame_path for frame_path in frame_paths if os.path.isfile(frame_path)]))
+            else:
+                animation_paths.append((animation_name, False, []))
+
+        images = {}
+        if self._loader is not None:
+            all_paths = [path for _, _, frame_paths in animation_paths for path in frame_paths]
+            futures = self._loader.load_images(all_paths)
+            self._loader.wait(futures)
+            images = {path: future.result() for path, future in zip(all_paths, futures)}
+
+        anim = {}
+        for animation_name, is_file, frame_paths in animation_paths:
+            anim[animation_name] = []
+            if is_file:
+                anim[animation_name] = SimpleImageSprite(frame_paths[0], slicer=self._slicer, image=images.get(frame_paths[0])).get_image()
+                continue
+            for frame_path in frame_paths:
+                next_frames = SimpleImageSprite(frame_path, slicer=self._slicer, image=images.get(frame_path)).get_image()
+                current_frame = anim[animation_name]
+                if next_frames is not None:
+                    if type(next_frames) is list:
+                        anim[animation_name] = [*current_frame, *next_frames]
+                    else:
+                        anim[animation_name].append(next_frames)
+        return anim
@@ -0,0 +1,186 @@
+from .core import *
+import hashlib
+import json
+import mmap
+import os
+import struct
+
+class SpriteCache:
+    """
+    Content-hashed on-disk cache for parsed animation dictionaries, see `SpriteDirectoryAnimation`.
+
+    Every distinct source surface (a decoded image, a sprite sheet the tiles are cut from or an atlas page)
+    is stored once as raw RGBA, frames are stored as areas of those surfaces in a JSON index.
+    A cache file is loaded with a single ``mmap`` and is invalidated as soon as the content of a file,
+    the file list, the slicer or the atlas parameters change. Parses of the same path with different
+    slicer or atlas parameters are cached side by side.
+    """
+    MAGIC = b"GCSPRITE"
+    VERSION = 1
+    FILE_EXTENSION = ".gcsprite"
+
+    def __init__(self, cache_dir):
+        """
+        Initializes the cache.
+
+        :param cache_dir: Directory for the cache files, created on the first save.
+        :type cache_dir: str
+        """
+        self._cache_dir = cache_dir
+
+    def get_key(self, project_path, slicer=None, atlas=None):
+        """
+        Creates the cache key of a parse, from the file list with a hash of every file's content
+        and the slicer and atlas parameters. Reading the files is much cheaper than decoding them.
+
+        :param project_path: Path of the animation file or directory.
+        :param slicer: The slicer used for parsing.
+        :type slicer: Slicer
+        :param atlas: The atlas used for parsing.
+        :type atlas: TextureAtlas
+        :return: Hex digest of the parameters and hex digest of the files and parameters, joined by ``-``.
+        :rtype: str
+        """
+        files = []
+        if os.path.isfile(project_path):
+            files.append(self._file_signature(project_path, os.path.basename(project_path)))
+        elif os.path.isdir(project_path):
+            for animation_filename in sorted(os.listdir(project_path)):
+                absolute_animation_path = os.path.join(project_path, animation_filename)
+                if os.path.isfile(absolute_animation_path):
+                    files.append(self._file_signature(absolute_animation_path, animation_filename))
+                elif os.path.isdir(absolute_animation_path):
+                    for frame_filename in sorted(os.listdir(absolute_animation_path)):
+                        frame_path = os.path.join(absolute_animation_path, frame_filename)
+                        if os.path.isfile(frame_path):
+                            files.append(self._file_signature(frame_path, os.path.join(animation_filename, frame_filename)))
+        config = {
+            "version": self.VERSION,
+            "slicer": list(slicer.get_config()) if slicer is not None else None,
+            "atlas": list(atlas.get_config()) if atlas is not None else None,
+        }
+        config_digest = hashlib.sha1(json.dumps(config, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+        description = dict(config, files=files)
+        return "{}-{}".format(config_digest, hashlib.sha1(json.dumps(description, sort_keys=True).encode("utf-8")).hexdigest())
+
+    def load(self, project_path, key) -> dict:
+        """
+        Loads a cached animation dictionary.
+
+        :param project_path: Path of the animation file or directory.
+        :param key: The key from `get_key`.
+        :return: The animation dictionary or None if there is no valid cache file.
+        """
+        path = self._get_path(project_path, key)
+        if not os.path.isfile(path):
+            return None
+        with open(path, "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                header_size = len(self.MAGIC) + 4
+                if data[:len(self.MAGIC)] != self.MAGIC:
+                    return None
+                index_size = struct.unpack("<I", data[len(self.MAGIC):header_size])[0]
+                index = json.loads(data[header_size:header_size + index_size].decode("utf-8"))
+                if index.get("version") != self.VERSION or index.get("key") != key:
+                    return None
+                blob_offset = header_size + index_size
+                roots = [self._load_surface(data, blob_offset + root["offset"], root["size"]) for root in index["roots"]]
+
+        def _frame(ref):
+            if type(ref) is list:
+                return [_frame(layer) for layer in ref]
+            root = roots[ref["root"]]
+            rect = pygame.Rect(ref["rect"])
+            return root if rect == root.get_rect() else root.subsurface(rect)
+
+        anim = {}
+        for state, frames in index["anim"].items():
+            anim[state] = [_frame(frame) for frame in frames["frames"]] if frames["is_list"] else _frame(frames["frames"])
+        return anim
+
+    def save(self, project_path, key, anim: dict):
+        """
+        Writes an animation dictionary to the cache and removes outdated cache files of the same path
+        and the same slicer and atlas parameters.
+
+        :param project_path: Path of the animation file or directory.
+        :param key: The key from `get_key`.
+        :param anim: The animation dictionary.
+        """
+        roots = []
+        root_indices = {}
+
+        def _ref(frame):
+            if type(frame) is list:
+                return [_ref(layer) for layer in frame]
+            root = frame.get_abs_parent()
+            if id(root) not in root_indices:
+                root_indices[id(root)] = len(roots)
+                roots.append(root)
+            offset = frame.get_abs_offset()
+            return {"root": root_indices[id(root)], "rect": [offset[0], offset[1], frame.get_width(), frame.get_height()]}
+
+        index = {"version": self.VERSION, "key": key, "anim": {}, "roots": []}
+        for state, frames in anim.items():
+            is_list = type(frames) is list
+            index["anim"][state] = {"is_list": is_list, "frames": [_ref(frame) for frame in frames] if is_list else _ref(frames)}
+
+        blobs = []
+        blob_size = 0
+        for root in roots:
+            blob = pygame.image.tobytes(root, "RGBA")
+            index["roots"].append({"offset": blob_size, "size": list(root.get_size())})
+            blobs.append(blob)
+            blob_size = blob_size + len(blob)
+
+        os.makedirs(self._cache_dir, exist_ok=True)
+        prefix = self._get_prefix(project_path) + key.split("-")[0] + "-"
+        for filename in os.listdir(self._cache_dir):
+            if filename.startswith(prefix) and filename.endswith(self.FILE_EXTENSION):
+                os.remove(os.path.join(self._cache_dir, filename))
+
+        index_data = json.dumps(index).encode("utf-8")
+        path = self._get_path(project_path, key)
+        with open(path + ".tmp", "wb") as file:
+            file.write(self.MAGIC)
+            file.write(struct.pack("<I", len(index_data)))
+            file.write(index_data)
+            for blob in blobs:
+                file.write(blob)
+        os.replace(path + ".tmp", path)
+
+    def clear(self):
+        """
+        Removes all cache files.
+        """
+        if not os.path.isdir(self._cache_dir):
+            return
+        for filename in os.listdir(self._cache_dir):
+            if filename.endswith(self.FILE_EXTENSION):
+                os.remove(os.path.join(self._cache_dir, filename))
+
+    def _file_signature(self, path, name):
+        content_hash = hashlib.sha1()
+        with open(path, "rb") as file:
+            for block in iter(lambda: file.read(1 << 20), b""):
+                content_hash.update(block)
+        return [name, content_hash.hexdigest()]
+
+    def _get_prefix(self, project_path):
+        return hashlib.sha1(os.path.abspath(project_path).encode("utf-8")).hexdigest()[:16] + "-"
+
+    def _get_path(self, project_path, key):
+        return os.path.join(self._cache_dir, self._get_prefix(project_path) + key + self.FILE_EXTENSION)
+
+    def _load_surface(self, data, offset, size):
+        view = memoryview(data)[offset:offset + size[0] * size[1] * 4]
+        try:
+            surface = pygame.image.frombuffer(view, tuple(size), "RGBA")
+            if pygame.display.get_surface() is not None:
+                converted = surface.convert_alpha()
+            else:
+                converted = surface.copy()
+            del surface
+        finally:
+            view.release()
+        return converted
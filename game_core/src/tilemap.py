@@ -1,5 +1,6 @@
 import pytmx
 from .core import *
+from collections import OrderedDict
 
 class TileMap:
     def __init__(self, filename):
@@ -9,20 +10,57 @@ class TileMap:
         self.animated_tiles = []
         self.tiled_object_groups = []
 
+    def get_tile_size(self):
+        """
+        :return: The size (width, height) of a tile in pixels.
+        """
+        return (self.tmxdata.tilewidth, self.tmxdata.tileheight)
+
+    def get_tile_layers(self):
+        """
+        :return: The gid rows of the visible tile layers in render order, indexed as ``layer[y][x]``.
+        """
+        return [layer.data for layer in self.tmxdata.visible_layers if isinstance(layer, pytmx.TiledTileLayer)]
+
+    def get_tile_image(self, gid):
+        """
+        :param gid: The gid of the tile.
+        :return: The tile image or None for empty tiles.
+        """
+        return self.tmxdata.get_tile_image_by_gid(gid)
+
+    def get_tile_properties(self, gid):
+        """
+        :param gid: The gid of the tile.
+        :return: Dictionary of the custom tile properties, e.g. ``solid``, or None.
+        """
+        return self.tmxdata.get_tile_properties_by_gid(gid)
+
     def render(self, surface):
+        self._scan_layers()
+        tile_width, tile_height = self.get_tile_size()
+        for layer in self.get_tile_layers():
+            for y, row in enumerate(layer):
+                for x, gid in enumerate(row):
+                    tile = self.get_tile_image(gid) if gid else None
+                    if tile:
+                        surface.blit(tile, (x * tile_width,
+                                            y * tile_height))
+
+    def _scan_layers(self):
+        # collects animated tiles and object groups, reset so that rendering twice doesn't duplicate them
+        self.animated_tiles = []
+        self.tiled_object_groups = []
         for layer in self.tmxdata.visible_layers:
             if isinstance(layer, pytmx.TiledTileLayer):
                 for x, y, gid, in layer:
-                    tile = self.tmxdata.get_tile_image_by_gid(gid)
                     p = self.tmxdata.get_tile_properties_by_gid(gid)
                     if p is not None and len(p['frames']) > 0:
                         self.animated_tiles.append({
+                            'gid': gid,
                             'grid_pos': (x * self.tmxdata.tilewidth, y * self.tmxdata.tileheight),
                             'animated_tiles': [frame for frame in p['frames']]
                         })
-                    if tile:
-                        surface.blit(tile, (x * self.tmxdata.tilewidth,
-                                            y * self.tmxdata.tileheight))
 
             elif isinstance(layer, pytmx.TiledObjectGroup):
                 tiled_obj_group = {
@@ -34,10 +72,305 @@ class TileMap:
                 self.tiled_object_groups.append(tiled_obj_group)
 
     def make_map(self):
-        temp_surface = pygame.Surface((self.width, self.height))
+        temp_surface = pygame.Surface((self.width, self.height)).convert()
         self.render(temp_surface)
         return (temp_surface, self.animated_tiles)
 
+    def make_chunks(self, chunk_size=(16, 16), max_chunks=None):
+        """
+        Like `make_map`, but returns a `TileMapChunks` that renders the map lazily in chunks
+        instead of one surface of the whole map.
+
+        :param chunk_size: Size of a chunk in tiles.
+        :param max_chunks: Chunks kept in memory, twice the visible chunks if None.
+        :return: Tuple of the `TileMapChunks` and the animated tiles.
+        """
+        self._scan_layers()
+        scheduler = AnimatedTileScheduler(self, bucket_size=chunk_size)
+        return (TileMapChunks(self, chunk_size, max_chunks, scheduler=scheduler), self.animated_tiles)
+
+_TILE_MAP_FORMATS = {} # file extension -> callable loading a map, registered by the modules of other formats
+
+def register_tile_map_format(file_extension, loader: callable):
+    """
+    Registers a map format for `load_tile_map`, e.g. `CompiledTileMap` for ``.gcmap`` files.
+
+    :param file_extension: Extension of the files, e.g. ``".gcmap"``.
+    :param loader: Callable (filename) -> `TileMap`.
+    """
+    _TILE_MAP_FORMATS[file_extension] = loader
+
+def load_tile_map(filename) -> TileMap:
+    """
+    Loads a map with the loader registered for its file extension, e.g. a compiled ``.gcmap`` map,
+    otherwise parses the ``.tmx`` file.
+
+    :param filename: Path to the map.
+    :return: A `TileMap` or `CompiledTileMap`.
+    """
+    for file_extension, loader in _TILE_MAP_FORMATS.items():
+        if filename.endswith(file_extension):
+            return loader(filename)
+    return TileMap(filename)
+
+class TileAnimation:
+    """
+    One timeline shared by every tile of the same animated gid.
+
+    :var gid: The gid of the animated tile.
+    :var frames: The frame images.
+    :var durations: The frame durations in milliseconds.
+    :var positions: Pixel positions of all instances on the map.
+    :var frame_index: Index of the shown frame.
+    :var time_left: Time until the next frame is due.
+    """
+    __slots__ = ("gid", "frames", "durations", "positions", "frame_index", "time_left")
+
+    def __init__(self, gid, frames, durations):
+        self.gid = gid
+        self.frames = frames
+        self.durations = durations
+        self.positions = []
+        self.frame_index = 0
+        self.time_left = durations[0]
+
+    def get_image(self):
+        """
+        :return: The image of the shown frame.
+        """
+        return self.frames[self.frame_index]
+
+class AnimatedTileScheduler:
+    """
+    Advances animated tiles. Tiles are grouped by their animated gid, so each animation has one timeline
+    and its frame images are looked up once. The instances are indexed in buckets of tiles, drawing
+    only blits the instances in buckets intersecting the view whose frame changed since they were last drawn.
+    """
+    def __init__(self, tile_map: TileMap, bucket_size=(16, 16)):
+        """
+        Groups the animated tiles of a rendered tile map, see `TileMap.make_map` and `TileMap.make_chunks`.
+
+        :param tile_map: The tile map.
+        :param bucket_size: Size of the index buckets in tiles. Matches the chunk size when used by `TileMapChunks`.
+        """
+        tile_width, tile_height = tile_map.get_tile_size()
+        self._bucket_pixel_size = (bucket_size[0] * tile_width, bucket_size[1] * tile_height)
+        self._animations = {} # gid -> TileAnimation
+        self._buckets = {} # (bucket x, bucket y) -> {gid: [positions]}
+        self._drawn_frames = {} # (bucket x, bucket y) -> {gid: frame index last drawn}
+        for animated_tile in tile_map.animated_tiles:
+            gid = animated_tile['gid']
+            animation = self._animations.get(gid)
+            if animation is None:
+                frames = animated_tile['animated_tiles']
+                animation = TileAnimation(gid, [tile_map.get_tile_image(frame.gid) for frame in frames], [frame.duration for frame in frames])
+                self._animations[gid] = animation
+            position = animated_tile['grid_pos']
+            animation.positions.append(position)
+            key = (position[0] // self._bucket_pixel_size[0], position[1] // self._bucket_pixel_size[1])
+            self._buckets.setdefault(key, {}).setdefault(gid, []).append(position)
+
+    def update(self, delta_time):
+        """
+        Advances the timelines.
+
+        :param delta_time: Time since the last frame in milliseconds.
+        :return: The animations whose frame changed.
+        """
+        changed = []
+        for animation in self._animations.values():
+            animation.time_left = animation.time_left - delta_time
+            if animation.time_left <= 0:
+                animation.frame_index = (animation.frame_index + 1) % len(animation.frames)
+                animation.time_left = animation.durations[animation.frame_index]
+                changed.append(animation)
+        return changed
+
+    def draw(self, surface: pygame.Surface, view_rect: pygame.Rect = None):
+        """
+        Blits the changed frames of the instances in view onto a map sized surface, e.g. from `TileMap.make_map`.
+        Instances outside the view are caught up once they come into view.
+
+        :param surface: The map surface.
+        :param view_rect: The visible map area, the whole map if None.
+        """
+        if view_rect is None:
+            keys = list(self._buckets.keys())
+        else:
+            bucket_width, bucket_height = self._bucket_pixel_size
+            keys = [(x, y)
+                    for y in range(view_rect.top // bucket_height, (view_rect.bottom - 1) // bucket_height + 1)
+                    for x in range(view_rect.left // bucket_width, (view_rect.right - 1) // bucket_width + 1)]
+        for key in keys:
+            self.draw_bucket(key, surface)
+
+    def draw_bucket(self, key, surface: pygame.Surface, offset=(0, 0)):
+        """
+        Blits the changed frames of the instances in one bucket.
+
+        :param key: The bucket (x, y).
+        :param surface: The target surface.
+        :param offset: Map pixel position of the surface's top left corner, e.g. of a chunk.
+        """
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return
+        drawn_frames = self._drawn_frames.setdefault(key, {})
+        blit_sequence = []
+        for gid, positions in bucket.items():
+            animation = self._animations[gid]
+            if drawn_frames.get(gid) == animation.frame_index:
+                continue
+            drawn_frames[gid] = animation.frame_index
+            image = animation.get_image()
+            blit_sequence.extend((image, (x - offset[0], y - offset[1])) for x, y in positions)
+        if len(blit_sequence) > 0:
+            surface.blits(blit_sequence, doreturn=False)
+
+    def invalidate_bucket(self, key):
+        """
+        Forces the next `draw_bucket` to blit every instance of the bucket, e.g. after its chunk was baked anew.
+
+        :param key: The bucket (x, y).
+        """
+        self._drawn_frames.pop(key, None)
+
+    def get_animations(self):
+        """
+        :return: The `TileAnimation` of every animated gid.
+        """
+        return list(self._animations.values())
+
+class TileMapChunks:
+    """
+    Renders a `TileMap` in fixed-size chunks. A chunk is baked on the first draw that sees it, only chunks
+    intersecting the camera are blitted and chunks that weren't visible for a while are evicted least recently
+    used first, so the memory depends on the viewport size instead of the map size.
+    """
+    def __init__(self, tile_map: TileMap, chunk_size=(16, 16), max_chunks=None, scheduler: AnimatedTileScheduler = None):
+        """
+        Initializes the chunks, nothing is baked yet.
+
+        :param tile_map: The tile map.
+        :param chunk_size: Size of a chunk in tiles.
+        :param max_chunks: Chunks kept in memory, twice the visible chunks if None.
+        :param scheduler: Animated tiles drawn into the visible chunks, its bucket size must match the chunk size.
+        """
+        self.tile_map = tile_map
+        self.max_chunks = max_chunks
+        self.scheduler = scheduler
+        tile_width, tile_height = tile_map.get_tile_size()
+        self._chunk_pixel_size = (chunk_size[0] * tile_width, chunk_size[1] * tile_height)
+        self._chunks = OrderedDict() # (chunk x, chunk y) -> surface, least recently drawn first
+        self._tile_overrides = {} # pixel position -> image blitted over the baked tiles, e.g. animated tiles
+        self._most_visible_chunks = 0
+        self._bakes = 0
+
+    def draw(self, surface: pygame.Surface, camera: 'Camera'):
+        """
+        Blits the chunks visible through the camera onto a surface.
+
+        :param surface: The target surface.
+        :param camera: The camera, its rect is the viewport.
+        """
+        view = pygame.Rect(-camera.rect.x, -camera.rect.y, camera.rect.width, camera.rect.height).clip(self.get_rect())
+        chunk_width, chunk_height = self._chunk_pixel_size
+        blit_sequence = []
+        for chunk_y in range(view.top // chunk_height, (view.bottom - 1) // chunk_height + 1):
+            for chunk_x in range(view.left // chunk_width, (view.right - 1) // chunk_width + 1):
+                chunk = self._get_chunk((chunk_x, chunk_y))
+                if self.scheduler is not None:
+                    self.scheduler.draw_bucket((chunk_x, chunk_y), chunk, (chunk_x * chunk_width, chunk_y * chunk_height))
+                blit_sequence.append((chunk, (chunk_x * chunk_width + camera.rect.x, chunk_y * chunk_height + camera.rect.y)))
+        if len(blit_sequence) > 0:
+            surface.blits(blit_sequence, doreturn=False)
+        self._most_visible_chunks = max(self._most_visible_chunks, len(blit_sequence))
+        self._evict()
+
+    def blit(self, image: pygame.Surface, position):
+        """
+        Blits an image over the baked tiles. The image is blitted again when an evicted chunk is baked anew.
+
+        :param image: The image.
+        :param position: Position in map pixels.
+        """
+        position = (int(position[0]), int(position[1]))
+        self._tile_overrides[position] = image
+        rect = pygame.Rect(position, image.get_size())
+        for key, chunk in self._chunks.items():
+            chunk_rect = self._get_chunk_rect(key)
+            if chunk_rect.colliderect(rect):
+                chunk.blit(image, (rect.x - chunk_rect.x, rect.y - chunk_rect.y))
+
+    def get_width(self):
+        return self.tile_map.width
+
+    def get_height(self):
+        return self.tile_map.height
+
+    def get_size(self):
+        return (self.tile_map.width, self.tile_map.height)
+
+    def get_rect(self):
+        return pygame.Rect(0, 0, self.tile_map.width, self.tile_map.height)
+
+    def get_stats(self):
+        """
+        :return: Dictionary with the resident `chunks`, their `bytes` and the number of `bakes`.
+        """
+        return {
+            "chunks": len(self._chunks),
+            "bytes": sum(chunk.get_width() * chunk.get_height() * chunk.get_bytesize() for chunk in self._chunks.values()),
+            "bakes": self._bakes,
+        }
+
+    def clear(self):
+        """
+        Drops all baked chunks, e.g. after the tile data changed.
+        """
+        self._chunks = OrderedDict()
+
+    def _get_chunk_rect(self, key):
+        chunk_width, chunk_height = self._chunk_pixel_size
+        return pygame.Rect(key[0] * chunk_width, key[1] * chunk_height, chunk_width, chunk_height).clip(self.get_rect())
+
+    def _get_chunk(self, key):
+        chunk = self._chunks.get(key)
+        if chunk is None:
+            chunk = self._bake(key)
+            self._chunks[key] = chunk
+        else:
+            self._chunks.move_to_end(key)
+        return chunk
+
+    def _bake(self, key):
+        tile_width, tile_height = self.tile_map.get_tile_size()
+        chunk_rect = self._get_chunk_rect(key)
+        chunk = pygame.Surface(chunk_rect.size).convert()
+        first_x, first_y = chunk_rect.x // tile_width, chunk_rect.y // tile_height
+        last_x, last_y = (chunk_rect.right - 1) // tile_width, (chunk_rect.bottom - 1) // tile_height
+        for layer in self.tile_map.get_tile_layers():
+            for y in range(first_y, last_y + 1):
+                row = layer[y]
+                for x in range(first_x, last_x + 1):
+                    gid = int(row[x])
+                    tile = self.tile_map.get_tile_image(gid) if gid else None
+                    if tile:
+                        chunk.blit(tile, (x * tile_width - chunk_rect.x, y * tile_height - chunk_rect.y))
+        for position, image in self._tile_overrides.items():
+            rect = pygame.Rect(position, image.get_size())
+            if chunk_rect.colliderect(rect):
+                chunk.blit(image, (rect.x - chunk_rect.x, rect.y - chunk_rect.y))
+        if self.scheduler is not None:
+            self.scheduler.invalidate_bucket(key)
+        self._bakes = self._bakes + 1
+        return chunk
+
+    def _evict(self):
+        max_chunks = self.max_chunks if self.max_chunks is not None else self._most_visible_chunks * 2
+        while len(self._chunks) > max_chunks:
+            self._chunks.popitem(last=False)
+
 class Camera:
 
     def __init__(self, camera_view_rect: pygame.Rect, camera_position=(0,0), camera_size=(0,0)):
@@ -48,11 +381,12 @@ class Camera:
         x = -target[0] + int(self.rect.width / 2)
         y = -target[1] + int(self.rect.height / 2)
 
-        x = min(self.camera_view_rect.x, x)
-        y = min(self.camera_view_rect.y, y)
+        if self.camera_view_rect is not None: # None for endless worlds
+            x = min(self.camera_view_rect.x, x)
+            y = min(self.camera_view_rect.y, y)
 
-        x = max(-(self.camera_view_rect.width - self.rect.width), x)
-        y = max(-(self.camera_view_rect.height - self.rect.height), y)
+            x = max(-(self.camera_view_rect.width - self.rect.width), x)
+            y = max(-(self.camera_view_rect.height - self.rect.height), y)
         self.rect.x, self.rect.y = x, y
 
     def apply(self, rect):
@@ -74,6 +408,7 @@ class TileMapDrawerPrefab(Engine):
         self.is_enabled = False
         self.priority_layer = -2
         self.tile_map_path = None
+        self.chunk_size = None # tiles per chunk, the whole map is rendered into one surface if None
         self._draw_surface = None
 
     def on_enable(self, inject=None):
@@ -81,6 +416,8 @@ class TileMapDrawerPrefab(Engine):
             return
         if 'tile_map_path' in inject:
             self.tile_map_path = inject['tile_map_path']
+        if 'chunk_size' in inject:
+            self.chunk_size = inject['chunk_size']
         if 'surface' in inject:
             self._draw_surface = inject['surface']
         else:
@@ -97,8 +434,13 @@ class TileMapDrawerPrefab(Engine):
         self.tile_map = None
         self.camera = None
 
-        self.tile_map = TileMap(self.tile_map_path)
-        self.map, self.animated_tiles = self.tile_map.make_map()
+        self.tile_map = load_tile_map(self.tile_map_path)
+        if self.chunk_size is not None:
+            self.map, self.animated_tiles = self.tile_map.make_chunks(self.chunk_size)
+            self.animated_tile_scheduler = self.map.scheduler
+        else:
+            self.map, self.animated_tiles = self.tile_map.make_map()
+            self.animated_tile_scheduler = AnimatedTileScheduler(self.tile_map)
 
         self.camera = Camera(
             camera_position=(0, 0),
@@ -110,31 +452,13 @@ class TileMapDrawerPrefab(Engine):
         if self.tile_map_path is None or self.tile_map is None:
             return
 
-        # calculate animation tiles
-        for animated_tile in self.animated_tiles:
-            if 'active_animation_index' not in animated_tile: # set first tile if not set
-                animated_tile['active_animation_index'] = 0
-                animated_tile['active_animation_time_left'] = animated_tile['animated_tiles'][animated_tile['active_animation_index']].duration
-
-                # draw tile
-                gid = animated_tile['animated_tiles'][animated_tile['active_animation_index']].gid
-                self.map.blit(self.tile_map.tmxdata.get_tile_image_by_gid(gid), animated_tile['grid_pos'])
-
-            else:
-                animated_tile['active_animation_time_left'] = animated_tile['active_animation_time_left'] - self.core.delta_time # calculate time of current animated tile
-                if animated_tile['active_animation_time_left'] <= 0: # change tile
-                    if animated_tile['active_animation_index']+1 >= len(animated_tile['animated_tiles']): # reset to first tile index
-                        animated_tile['active_animation_index'] = 0
-                        animated_tile['active_animation_time_left'] = animated_tile['animated_tiles'][animated_tile['active_animation_index']].duration
-                    else: # choose next index
-                        animated_tile['active_animation_index'] = animated_tile['active_animation_index'] + 1
-                        animated_tile['active_animation_time_left'] = animated_tile['animated_tiles'][animated_tile['active_animation_index']].duration
-
-                    # draw tile
-                    gid = animated_tile['animated_tiles'][animated_tile['active_animation_index']].gid
-                    self.map.blit(self.tile_map.tmxdata.get_tile_image_by_gid(gid), animated_tile['grid_pos'])
-
-        self._draw_surface.blit(self.map, self.camera.apply(self.map.get_rect()))
+        self.animated_tile_scheduler.update(self.core.delta_time)
+        if isinstance(self.map, TileMapChunks):
+            self.map.draw(self._draw_surface, self.camera)
+        else:
+            view_rect = pygame.Rect(-self.camera.rect.x, -self.camera.rect.y, self.camera.rect.width, self.camera.rect.height)
+            self.animated_tile_scheduler.draw(self.map, view_rect.clip(self.map.get_rect()))
+            self._draw_surface.blit(self.map, self.camera.apply(self.map.get_rect()))
 
     def get_camera(self):
         return self.camera
@@ -0,0 +1,244 @@
+from .core import *
+from .tilemap import TileMap, load_tile_map, register_tile_map_format
+from .atlas import TextureAtlas
+from collections import namedtuple
+from types import SimpleNamespace
+import argparse
+import json
+import mmap
+import os
+import struct
+import numpy as np
+import pytmx
+
+AnimationFrame = namedtuple("AnimationFrame", ["gid", "duration"])
+
+_OBJECT_ATTRIBUTES = ["id", "name", "type", "x", "y", "width", "height", "rotation", "gid", "visible"]
+
+#################
+### Compiling ###
+#################
+
+def compile_tile_map(tmx_path, output_path=None, page_size=(2048, 2048)):
+    """
+    Compiles a ``.tmx`` map into a binary file that `CompiledTileMap` loads without parsing XML.
+    The visible tile layers are stored as ``uint32`` gid arrays, the used tile images packed into
+    texture atlas pages, the object groups and the animation tables as JSON.
+    Needs an initialized display, tile images are loaded through ``pytmx.load_pygame``.
+
+    :param tmx_path: Path to the ``.tmx`` file.
+    :param output_path: Path of the compiled file, the tmx path with the `CompiledTileMap.FILE_EXTENSION` if None.
+    :param page_size: Size of the atlas pages.
+    :return: The path of the compiled file.
+    """
+    if output_path is None:
+        output_path = os.path.splitext(tmx_path)[0] + CompiledTileMap.FILE_EXTENSION
+    tmxdata = pytmx.load_pygame(tmx_path, pixelalpha=True)
+
+    layers = []
+    object_groups = []
+    for layer in tmxdata.visible_layers:
+        if isinstance(layer, pytmx.TiledTileLayer):
+            layers.append((layer.name, np.array(layer.data, dtype="<u4").reshape((tmxdata.height, tmxdata.width))))
+        elif isinstance(layer, pytmx.TiledObjectGroup):
+            object_groups.append({
+                "name": layer.name,
+                "properties": _to_json_properties(layer.properties),
+                "objects": [_object_to_dict(tiled_obj) for tiled_obj in layer],
+            })
+
+    # the animation frames may use gids that aren't placed on any layer
+    used_gids = set()
+    for _, data in layers:
+        used_gids.update(int(gid) for gid in np.unique(data) if gid != 0)
+    animations = {}
+    for gid in sorted(used_gids):
+        properties = tmxdata.get_tile_properties_by_gid(gid)
+        if properties is not None and len(properties.get('frames', [])) > 0:
+            animations[gid] = [[frame.gid, frame.duration] for frame in properties['frames']]
+    for frames in animations.values():
+        used_gids.update(frame_gid for frame_gid, _ in frames)
+    tile_properties = {}
+    for gid in sorted(used_gids):
+        properties = tmxdata.get_tile_properties_by_gid(gid)
+        if properties is not None:
+            properties = _to_json_properties({key: value for key, value in properties.items() if key != 'frames'})
+            if len(properties) > 0:
+                tile_properties[gid] = properties
+
+    atlas = TextureAtlas(page_size=page_size, padding=0)
+    tiles = {}
+    gids = [gid for gid in sorted(used_gids) if tmxdata.get_tile_image_by_gid(gid) is not None]
+    for gid, region in zip(gids, atlas.add_many([tmxdata.get_tile_image_by_gid(gid) for gid in gids])):
+        tiles[gid] = [region.page_index, region.rect.x, region.rect.y, region.rect.width, region.rect.height]
+    # the pages are cropped to the packed area, a small tileset doesn't need a full page
+    page_sizes = [[0, 0] for _ in atlas.get_pages()]
+    for page_index, x, y, width, height in tiles.values():
+        page_sizes[page_index] = [max(page_sizes[page_index][0], x + width), max(page_sizes[page_index][1], y + height)]
+    pages = [page.subsurface((0, 0, max(1, size[0]), max(1, size[1]))) for page, size in zip(atlas.get_pages(), page_sizes)]
+
+    blobs = []
+    blob_size = 0
+
+    def _add_blob(data):
+        nonlocal blob_size
+        padding = (-blob_size) % 16 # keeps the arrays aligned for frombuffer
+        if padding > 0:
+            blobs.append(b"\0" * padding)
+            blob_size = blob_size + padding
+        offset = blob_size
+        blobs.append(data)
+        blob_size = blob_size + len(data)
+        return offset
+
+    index = {
+        "version": CompiledTileMap.VERSION,
+        "size": [tmxdata.width, tmxdata.height],
+        "tile_size": [tmxdata.tilewidth, tmxdata.tileheight],
+        "layers": [{"name": name, "offset": _add_blob(data.tobytes())} for name, data in layers],
+        "pages": [{"offset": _add_blob(pygame.image.tobytes(page, "RGBA")), "size": list(page.get_size())} for page in pages],
+        "tiles": {str(gid): rect for gid, rect in tiles.items()},
+        "animations": {str(gid): frames for gid, frames in animations.items()},
+        "tile_properties": {str(gid): properties for gid, properties in tile_properties.items()},
+        "object_groups": object_groups,
+    }
+    index_data = json.dumps(index).encode("utf-8")
+    header_size = len(CompiledTileMap.MAGIC) + 4 + len(index_data)
+    header_padding = (-header_size) % 16
+    with open(output_path + ".tmp", "wb") as file:
+        file.write(CompiledTileMap.MAGIC)
+        file.write(struct.pack("<I", len(index_data) + header_padding))
+        file.write(index_data + b" " * header_padding)
+        for blob in blobs:
+            file.write(blob)
+    os.replace(output_path + ".tmp", output_path)
+    return output_path
+
+def _to_json_properties(properties):
+    return {key: value if isinstance(value, (str, int, float, bool)) or value is None else str(value) for key, value in properties.items()}
+
+def _object_to_dict(tiled_obj):
+    data = {attribute: getattr(tiled_obj, attribute, None) for attribute in _OBJECT_ATTRIBUTES}
+    data["properties"] = _to_json_properties(tiled_obj.properties)
+    if hasattr(tiled_obj, "points"):
+        data["points"] = [[point[0], point[1]] for point in tiled_obj.points]
+    return data
+
+###############
+### Loading ###
+###############
+
+class CompiledTileMap(TileMap):
+    """
+    A `TileMap` loaded from a file created by `compile_tile_map`. The file is memory mapped, the gid layers
+    are NumPy views of the mapping and the tile images subsurfaces of the atlas pages, so no XML is parsed.
+    Works with `TileMap.make_map`, `TileMap.make_chunks`, `AnimatedTileScheduler` and `TileMapDrawerPrefab`.
+    Tile objects are `types.SimpleNamespace` with the attributes of the ``pytmx`` objects.
+    """
+    MAGIC = b"GCTILEMAP"
+    VERSION = 1
+    FILE_EXTENSION = ".gcmap"
+
+    def __init__(self, filename):
+        """
+        Loads a compiled map.
+
+        :param filename: Path to the compiled file.
+        :raises ValueError: If the file isn't a compiled map of the current version.
+        """
+        self.tmxdata = None
+        self.animated_tiles = []
+        self.tiled_object_groups = []
+        with open(filename, "rb") as file:
+            self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._data[:len(self.MAGIC)] != self.MAGIC:
+            raise ValueError("'{}' is not a compiled tile map".format(filename))
+        index_size = struct.unpack("<I", self._data[len(self.MAGIC):len(self.MAGIC) + 4])[0]
+        blob_offset = len(self.MAGIC) + 4 + index_size
+        self._index = json.loads(self._data[len(self.MAGIC) + 4:blob_offset].decode("utf-8"))
+        if self._index.get("version") != self.VERSION:
+            raise ValueError("'{}' was compiled with version {}, recompile it".format(filename, self._index.get("version")))
+
+        map_width, map_height = self._index["size"]
+        self._tile_size = tuple(self._index["tile_size"])
+        self.width = map_width * self._tile_size[0]
+        self.height = map_height * self._tile_size[1]
+        self._layers = [
+            np.frombuffer(self._data, dtype="<u4", count=map_width * map_height, offset=blob_offset + layer["offset"]).reshape((map_height, map_width))
+            for layer in self._index["layers"]
+        ]
+        self._pages = [self._load_page(blob_offset + page["offset"], page["size"]) for page in self._index["pages"]]
+        self._tile_images = {}
+        for gid, (page_index, x, y, width, height) in self._index["tiles"].items():
+            self._tile_images[int(gid)] = self._pages[page_index].subsurface((x, y, width, height))
+        self._animations = {int(gid): [AnimationFrame(frame_gid, duration) for frame_gid, duration in frames] for gid, frames in self._index["animations"].items()}
+        self._tile_properties = {int(gid): properties for gid, properties in self._index.get("tile_properties", {}).items()}
+
+    def get_tile_size(self):
+        return self._tile_size
+
+    def get_tile_layers(self):
+        return self._layers
+
+    def get_tile_image(self, gid):
+        return self._tile_images.get(int(gid))
+
+    def get_tile_properties(self, gid):
+        return self._tile_properties.get(int(gid))
+
+    def get_tile_animation(self, gid):
+        """
+        :param gid: The gid of the tile.
+        :return: List of `AnimationFrame` or None if the tile isn't animated.
+        """
+        return self._animations.get(int(gid))
+
+    def _scan_layers(self):
+        self.animated_tiles = []
+        self.tiled_object_groups = []
+        if len(self._animations) > 0:
+            animated_gids = np.array(list(self._animations.keys()), dtype="<u4")
+            for layer in self._layers:
+                ys, xs = np.nonzero(np.isin(layer, animated_gids))
+                for x, y in zip(xs.tolist(), ys.tolist()):
+                    gid = int(layer[y, x])
+                    self.animated_tiles.append({
+                        'gid': gid,
+                        'grid_pos': (x * self._tile_size[0], y * self._tile_size[1]),
+                        'animated_tiles': list(self._animations[gid])
+                    })
+        for object_group in self._index["object_groups"]:
+            self.tiled_object_groups.append({
+                "layer": SimpleNamespace(name=object_group["name"], properties=object_group["properties"]),
+                "tiled_objs": [SimpleNamespace(**tiled_obj) for tiled_obj in object_group["objects"]]
+            })
+
+    def _load_page(self, offset, size):
+        view = memoryview(self._data)[offset:offset + size[0] * size[1] * 4]
+        try:
+            page = pygame.image.frombuffer(view, tuple(size), "RGBA")
+            converted = page.convert_alpha() if pygame.display.get_surface() is not None else page.copy()
+            del page
+        finally:
+            view.release()
+        return converted
+
+register_tile_map_format(CompiledTileMap.FILE_EXTENSION, CompiledTileMap)
+
+def _main(argv=None):
+    # python -m game_core.src.tilemap_compiler level.tmx
+    parser = argparse.ArgumentParser(description="Compile .tmx maps for CompiledTileMap.")
+    parser.add_argument("tmx", nargs="+", help="maps to compile")
+    parser.add_argument("--output", help="output path, only for a single map")
+    args = parser.parse_args(argv)
+    if args.output is not None and len(args.tmx) > 1:
+        parser.error("--output can only be used with a single map")
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    for tmx_path in args.tmx:
+        print(compile_tile_map(tmx_path, args.output))
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,249 @@
+from .core import *
+from .tilemap import Camera
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
+import numpy as np
+
+class WorldChunkStreamer:
+    """
+    Streams the chunks of an endless procedural world around a `Camera`. Missing chunks are generated
+    on a worker pool while the game keeps running, finished chunks are turned into surfaces a few per frame,
+    and chunks far from the camera are evicted least recently used first. Generated chunks can be cached
+    on disk, so revisited or restarted worlds don't generate them again.
+
+    The generator runs in a worker thread and must not touch the display. It receives the chunk
+    coordinates and returns the chunk pixels as ``uint8`` array of shape (width, height, 3), the layout of
+    ``pygame.surfarray``. A smaller array, e.g. one value per cell, is scaled up to the chunk size.
+
+    .. code-block:: python
+
+        def generate(chunk_x, chunk_y):
+            return np.full((64, 64, 3), (chunk_x * 40 % 255, chunk_y * 40 % 255, 0), dtype=np.uint8)
+
+        streamer = WorldChunkStreamer(generate, chunk_size=(192, 192))
+        ...
+        streamer.update(camera)
+        streamer.draw(self.core.window, camera)
+    """
+    def __init__(self, generate_chunk: callable, chunk_size=(256, 256), max_workers=None, max_chunks=None, cache_dir=None, preload_margin=1, max_uploads_per_frame=2):
+        """
+        Initializes the streamer.
+
+        :param generate_chunk: Callable (chunk_x, chunk_y) -> pixel array, called in a worker thread.
+        :param chunk_size: Size of a chunk in pixels.
+        :param max_workers: Number of worker threads, defaults to the `ThreadPoolExecutor` default.
+        :param max_chunks: Chunks kept in memory, twice the chunks around the camera if None.
+        :param cache_dir: Directory for generated chunks, no disk cache if None. Use one directory per world seed.
+        :param preload_margin: Chunks generated ahead around the visible area.
+        :param max_uploads_per_frame: Finished chunks turned into surfaces per `update`.
+        """
+        self._generate_chunk = generate_chunk
+        self.chunk_size = tuple(chunk_size)
+        self.max_chunks = max_chunks
+        self.cache_dir = cache_dir
+        self.preload_margin = preload_margin
+        self.max_uploads_per_frame = max_uploads_per_frame
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="GameCoreWorldStreamer")
+        self._chunks = OrderedDict() # (chunk x, chunk y) -> surface, least recently visible first
+        self._pending = {} # (chunk x, chunk y) -> future
+        self._wanted_chunks = 0
+        self._generated = 0
+        self._cache_hits = 0
+        self._stats_lock = threading.Lock()
+
+    def update(self, camera: Camera):
+        """
+        Requests the chunks around the camera, nearest first, and uploads finished chunks. Call once per frame.
+
+        :param camera: The camera.
+        :raises Exception: If the generator or the disk cache failed for a chunk, chained to the original exception.
+        """
+        wanted = self._get_chunk_keys(camera, self.preload_margin)
+        self._wanted_chunks = len(wanted)
+        center = self._get_view_rect(camera).center
+        wanted.sort(key=lambda key: self._distance_to_chunk(key, center))
+        for key in wanted:
+            if key in self._chunks:
+                self._chunks.move_to_end(key)
+            elif key not in self._pending:
+                self._pending[key] = self._executor.submit(self._load_chunk, key)
+
+        wanted_keys = set(wanted)
+        uploads = 0
+        for key in [key for key in wanted if key in self._pending and self._pending[key].done()]:
+            if uploads >= self.max_uploads_per_frame:
+                break
+            future = self._pending.pop(key)
+            if future.exception() is not None:
+                # the chunk is requested again by the next update
+                raise Exception("failed to generate chunk {}".format(key)) from future.exception()
+            self._chunks[key] = self._to_surface(future.result())
+            uploads = uploads + 1
+        # requests that left the area are dropped, they are requested again when needed
+        for key in [key for key in self._pending if key not in wanted_keys]:
+            if self._pending[key].cancel() or self._pending[key].done():
+                del self._pending[key]
+        self._evict()
+
+    def draw(self, surface: pygame.Surface, camera: Camera):
+        """
+        Blits the resident chunks visible through the camera. Chunks that are still generated are left out.
+
+        :param surface: The target surface.
+        :param camera: The camera.
+        """
+        blit_sequence = []
+        for key in self._get_chunk_keys(camera, 0):
+            chunk = self._chunks.get(key)
+            if chunk is not None:
+                blit_sequence.append((chunk, (key[0] * self.chunk_size[0] + camera.rect.x, key[1] * self.chunk_size[1] + camera.rect.y)))
+        if len(blit_sequence) > 0:
+            surface.blits(blit_sequence, doreturn=False)
+
+    def is_ready(self, camera: Camera) -> bool:
+        """
+        :param camera: The camera.
+        :return: True if every chunk visible through the camera is resident.
+        """
+        return all(key in self._chunks for key in self._get_chunk_keys(camera, 0))
+
+    def get_stats(self) -> dict:
+        """
+        :return: Dictionary with the resident `chunks`, the `pending` requests, the `generated` chunks and the disk `cache_hits`.
+        """
+        return {
+            "chunks": len(self._chunks),
+            "pending": len(self._pending),
+            "generated": self._generated,
+            "cache_hits": self._cache_hits,
+        }
+
+    def clear(self):
+        """
+        Drops all resident chunks, e.g. after the world parameters changed. The disk cache stays untouched.
+        """
+        for future in self._pending.values():
+            future.cancel()
+        self._pending = {}
+        self._chunks = OrderedDict()
+
+    def shutdown(self):
+        """
+        Stops the workers, pending chunks are discarded.
+        """
+        for future in self._pending.values():
+            future.cancel()
+        self._pending = {}
+        self._executor.shutdown(wait=False)
+
+    def _get_view_rect(self, camera):
+        return pygame.Rect(-camera.rect.x, -camera.rect.y, camera.rect.width, camera.rect.height)
+
+    def _get_chunk_keys(self, camera, margin):
+        view = self._get_view_rect(camera)
+        chunk_width, chunk_height = self.chunk_size
+        return [(x, y)
+                for y in range(view.top // chunk_height - margin, (view.bottom - 1) // chunk_height + 1 + margin)
+                for x in range(view.left // chunk_width - margin, (view.right - 1) // chunk_width + 1 + margin)]
+
+    def _distance_to_chunk(self, key, position):
+        dx = (key[0] + 0.5) * self.chunk_size[0] - position[0]
+        dy = (key[1] + 0.5) * self.chunk_size[1] - position[1]
+        return dx * dx + dy * dy
+
+    def _get_cache_path(self, key):
+        return os.path.join(self.cache_dir, "{}_{}.npy".format(key[0], key[1]))
+
+    def _load_chunk(self, key):
+        # runs in a worker thread
+        if self.cache_dir is not None:
+            path = self._get_cache_path(key)
+            if os.path.isfile(path):
+                try:
+                    pixels = np.load(path)
+                    with self._stats_lock:
+                        self._cache_hits = self._cache_hits + 1
+                    return pixels
+                except (OSError, ValueError):
+                    pass # corrupt cache file, generate again
+        pixels = np.ascontiguousarray(self._generate_chunk(key[0], key[1]), dtype=np.uint8)
+        with self._stats_lock:
+            self._generated = self._generated + 1
+        if self.cache_dir is not None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._get_cache_path(key)
+            temp_path = "{}.{}.tmp".format(path, threading.get_ident())
+            with open(temp_path, "wb") as file:
+                np.save(file, pixels)
+            os.replace(temp_path, path)
+        return pixels
+
+    def _to_surface(self, pixels):
+        surface = pygame.surfarray.make_surface(pixels)
+        if surface.get_size() != self.chunk_size:
+            surface = pygame.transform.scale(surface, self.chunk_size)
+        return surface.convert() if pygame.display.get_surface() is not None else surface
+
+    def _evict(self):
+        max_chunks = self.max_chunks if self.max_chunks is not None else self._wanted_chunks * 2
+        while len(self._chunks) > max_chunks:
+            self._chunks.popitem(last=False)
+
+class WorldStreamDrawerPrefab(Engine):
+    """
+    Draws an endless procedural world streamed by a `WorldChunkStreamer` through an unbounded `Camera`,
+    the counterpart of `TileMapDrawerPrefab` for generated worlds.
+
+    .. code-block:: python
+
+        self.world_drawer = self.core.instantiate(WorldStreamDrawerPrefab)
+        self.world_drawer.enable(generate_chunk=generate, chunk_size=(192, 192), cache_dir=".world_cache")
+        self.camera = self.world_drawer.get_camera()
+    """
+    def awake(self):
+        self.is_enabled = False
+        self.priority_layer = -2
+        self.generate_chunk = None
+        self.chunk_size = (256, 256)
+        self.cache_dir = None
+        self.streamer = None
+        self.camera = None
+        self._draw_surface = None
+
+    def on_enable(self, inject=None):
+        if inject is None:
+            return
+        if 'generate_chunk' in inject:
+            self.generate_chunk = inject['generate_chunk']
+        if 'chunk_size' in inject:
+            self.chunk_size = inject['chunk_size']
+        if 'cache_dir' in inject:
+            self.cache_dir = inject['cache_dir']
+        if 'surface' in inject:
+            self._draw_surface = inject['surface']
+        else:
+            self._draw_surface = self.core.window
+
+    def start(self):
+        if self.generate_chunk is None:
+            raise ValueError("generate_chunk can't be None, did you miss .enable(generate_chunk=...)?")
+        self.streamer = WorldChunkStreamer(self.generate_chunk, chunk_size=self.chunk_size, cache_dir=self.cache_dir)
+        self.camera = Camera(camera_view_rect=None, camera_size=self.core.window_size)
+
+    def update(self):
+        if self.streamer is None:
+            return
+        self.streamer.update(self.camera)
+        self.streamer.draw(self._draw_surface, self.camera)
+
+    def on_destroy(self):
+        if self.streamer is not None:
+            self.streamer.shutdown()
+
+    def get_camera(self):
+        return self.camera
+
+    def get_streamer(self):
+        return self.streamer
@@ -0,0 +1,39 @@
+import os
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np
+from game_core.examples.powder_simulation import Material, PowderGrid
+
+DENSITY_MAP = {
+    Material.EMPTY: 0,
+    Material.SAND: 5,
+    Material.WATER: 2,
+    Material.STONE: 10,
+    Material.WOOD: 3,
+    Material.FIRE: -1,
+    Material.SMOKE: -2,
+    Material.PLANT: 2,
+    Material.ICE: 3,
+    Material.ACID: 2
+}
+
+def test_water_column_levels_out_with_chunks():
+    grid = PowderGrid(60, 60, DENSITY_MAP, {}, {Material.ICE: 5}, seed=1, chunk_size=8)
+    grid.set_material(slice(28, 32), slice(0, 60), Material.WATER)
+    for _ in range(3000):
+        grid.step()
+    water = grid.materials == Material.WATER.value
+    heights = water.sum(axis=0)
+    assert water.sum() == 240
+    assert heights.max() - heights.min() <= 1
+
+def test_water_flows_sideways_before_falling_diagonally():
+    for seed in range(50):
+        grid = PowderGrid(8, 6, DENSITY_MAP, {}, {Material.ICE: 5}, seed=seed)
+        grid.set_material(slice(0, 8), 3, Material.STONE)
+        grid.set_material([2, 4], 3, Material.EMPTY)
+        grid.set_material(3, 2, Material.WATER)
+        grid.step()
+        ys, xs = np.nonzero(grid.materials == Material.WATER.value)
+        assert ys.tolist() == [2]